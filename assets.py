@@ -0,0 +1,202 @@
+"""Company logo for the PDF report, loaded once per process and cached in memory."""
+import io
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from instrumentation import timed
+
+# Logo URLs
+LOGO_URL = "https://drive.google.com/uc?export=download&id=1VebdT2loVGX57noP9t2GgQhwCNn8AA3h"
+FALLBACK_LOGO_URL = "https://onedrive.live.com/download?cid=A48CC9068E3FACE0&resid=A48CC9068E3FACE0%21s252b6fb7fcd04f53968b2a09114d33ed"
+
+# Logo cache settings: a local logo file overrides the URLs, offline mode never
+# touches the network, and the cached logo is refreshed after LOGO_CACHE_TTL seconds.
+LOGO_PATH = os.environ.get("AS3610_LOGO_PATH", "")
+LOGO_OFFLINE = os.environ.get("AS3610_LOGO_OFFLINE", "").lower() in ("1", "true", "yes")
+LOGO_CACHE_TTL = float(os.environ.get("AS3610_LOGO_TTL", 24 * 3600))
+
+# Longest time to wait for the logo hosts, in seconds. The local copy (if
+# present) is used when neither host has answered by then.
+LOGO_TIMEOUT = float(os.environ.get("AS3610_LOGO_TIMEOUT", 3))
+# Each downloaded logo is saved here, so the next cold start serves it at once
+LOGO_LOCAL_COPY = os.environ.get(
+    "AS3610_LOGO_LOCAL_COPY",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "logo.png")
+)
+
+_logo_cache = {"data": None, "reader": None, "loaded_at": None, "url": None, "validators": {}, "refreshing": False}
+_logo_lock = threading.Lock()
+
+_session = None
+_executor = None
+_network_lock = threading.Lock()
+
+def _network():
+    """Return the pooled requests session and the thread pool used to fetch the logo."""
+    global _session, _executor
+    with _network_lock:
+        if _session is None:
+            import requests
+            _session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=4)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+            _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="logo-fetch")
+        return _session, _executor
+
+def _reset_network():
+    global _session, _executor, _network_lock
+    _session, _executor, _network_lock = None, None, threading.Lock()
+    _logo_cache["refreshing"] = False
+
+# Threads of the pool do not survive a fork, so worker processes start their own
+os.register_at_fork(after_in_child=_reset_network)
+
+def _fetch(session, url, validators):
+    """GET one logo URL, conditionally if `validators` are given.
+
+    Returns (url, data, validators), with data None when the host answered
+    304 Not Modified. Raises on any other failure.
+    """
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    response = session.get(url, headers=headers, timeout=(LOGO_TIMEOUT, LOGO_TIMEOUT))
+    if response.status_code == 304 and headers:
+        return url, None, validators
+    if response.status_code != 200 or not response.content:
+        raise ValueError(f"logo host returned HTTP {response.status_code}")
+    return url, response.content, {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified")
+    }
+
+@timed()
+def fetch_logo(cached_url=None, validators=None):
+    """Race LOGO_URL and FALLBACK_LOGO_URL and return the first good response.
+
+    Both hosts are requested at once over a pooled session, so a slow or dead
+    host does not delay the other. The host that served the cached copy
+    (`cached_url`) is asked to revalidate it with `validators` (ETag and
+    Last-Modified). Returns (url, data, validators), where data is None if
+    the cached copy is still current, or None if no host answered within
+    LOGO_TIMEOUT.
+    """
+    session, executor = _network()
+    futures = {
+        executor.submit(_fetch, session, url, validators if url == cached_url else {})
+        for url in dict.fromkeys([LOGO_URL, FALLBACK_LOGO_URL])
+    }
+    deadline = time.monotonic() + LOGO_TIMEOUT
+    while futures:
+        done, futures = wait(futures, timeout=max(deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+    return None
+
+def _read_file(path):
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+@timed("download_logo")
+def _load_logo():
+    """Return (data, url, validators) of the logo, revalidating the cached copy if there is one."""
+    if LOGO_PATH:
+        data = _read_file(LOGO_PATH)
+        if data:
+            return data, None, {}
+    if not LOGO_OFFLINE:
+        result = fetch_logo(_logo_cache["url"], _logo_cache["validators"])
+        if result:
+            url, data, validators = result
+            return (data if data is not None else _logo_cache["data"]), url, validators
+    # Keep a previously downloaded logo rather than replacing it with the local copy
+    if _logo_cache["data"] is not None and _logo_cache["url"]:
+        return _logo_cache["data"], _logo_cache["url"], _logo_cache["validators"]
+    return _read_file(LOGO_LOCAL_COPY), None, {}
+
+def download_logo():
+    """Download company logo for PDF report, returning the image bytes or None.
+
+    Falls back to the local copy of the logo when offline or when neither
+    host answers in time.
+    """
+    return _load_logo()[0]
+
+def _save_local_copy(data):
+    """Replace the local copy of the logo with `data`, ignoring failures."""
+    tmp = None
+    try:
+        os.makedirs(os.path.dirname(LOGO_LOCAL_COPY), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(LOGO_LOCAL_COPY), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, LOGO_LOCAL_COPY)
+    except OSError:
+        if tmp and os.path.exists(tmp):
+            os.unlink(tmp)
+
+def _set_logo(data, url, validators):
+    """Store a loaded logo in the cache (called with _logo_lock held)."""
+    from reportlab.lib.utils import ImageReader
+    reader = _logo_cache["reader"] if data is not None and data is _logo_cache["data"] else None
+    if data and reader is None:
+        try:
+            reader = ImageReader(io.BytesIO(data))
+        except Exception:
+            data, url, validators = None, None, {}
+        else:
+            if url:
+                _save_local_copy(data)
+    _logo_cache.update(data=data, reader=reader, loaded_at=time.monotonic(), url=url, validators=validators)
+
+def _refresh_logo():
+    """Load the logo from the hosts and update the cache (runs in the background)."""
+    try:
+        result = _load_logo()
+    except Exception:
+        result = None
+    with _logo_lock:
+        if result is not None:
+            _set_logo(*result)
+        _logo_cache["refreshing"] = False
+
+def get_logo():
+    """Return the cached company logo as an ImageReader, or None if unavailable.
+
+    The logo is loaded once per process and revalidated with the host after
+    LOGO_CACHE_TTL seconds. Whenever a logo is at hand (the cached one or the
+    local copy) it is returned at once and the hosts are asked in the
+    background; only a process with no logo at all waits for them, and a
+    failed download is cached too, so that happens at most once per TTL.
+    """
+    with _logo_lock:
+        loaded_at = _logo_cache["loaded_at"]
+        if loaded_at is None or time.monotonic() - loaded_at > LOGO_CACHE_TTL:
+            if loaded_at is None and not LOGO_PATH:
+                local = _read_file(LOGO_LOCAL_COPY)
+                if local:
+                    _set_logo(local, None, {})
+            if _logo_cache["reader"] is None or LOGO_PATH or LOGO_OFFLINE:
+                _set_logo(*_load_logo())
+            elif not _logo_cache["refreshing"]:
+                _logo_cache["refreshing"] = True
+                _network()[1].submit(_refresh_logo)
+        return _logo_cache["reader"]
+
+def clear_logo_cache():
+    """Forget the cached logo so the next report loads it again."""
+    with _logo_lock:
+        _logo_cache.update(data=None, reader=None, loaded_at=None, url=None, validators={})
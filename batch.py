@@ -0,0 +1,284 @@
+"""Command-line batch runner for the AS 3610.2 load combination calculator.
+
+Reads load cases from a CSV, JSON or JSON Lines file, evaluates all load
+combinations with the vectorized engine and writes one row per case, stage,
+combination and γ_d. Optionally writes a PDF report per case, rendered in
+parallel across worker processes, or one consolidated PDF report with a bay
+per case.
+
+    python batch.py cases.csv --out results.csv --reports reports/ --workers 4
+    python batch.py cases.csv --out results.parquet --chunk-size 50000
+    python batch.py cases.csv --consolidated site.pdf --project-name "Site A"
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+from loads import DEFAULT_INPUTS, COMBINATION_STAGES, GAMMA_D_VALUES, calculate_concrete_load
+from engine import compute_combinations_batch, get_results_table
+from export import ArrowResultWriter, long_format_columns
+from instrumentation import span, write_metrics
+
+RESULT_COLUMNS = [
+    "case", "project_number", "project_name", "stage", "combination",
+    "gamma_d", "vertical", "horizontal"
+]
+
+def read_cases(path):
+    """Yield load cases from a CSV, JSON or JSON Lines file as dicts.
+
+    CSV and JSON Lines files are read one row at a time. A JSON file must hold
+    a list of objects and is read as a whole.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, newline='', encoding='utf-8') as f:
+        if ext == ".csv":
+            yield from csv.DictReader(f)
+        elif ext in (".jsonl", ".ndjson"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif ext == ".json":
+            yield from json.load(f)
+        else:
+            raise ValueError(f"Unsupported input file type '{ext}'")
+
+def parse_case(row, index):
+    """Convert a raw input row into an inputs dict, filling in default values.
+
+    Raises ValueError naming the row, case and field of a value that is not a number.
+    """
+    inputs = {}
+    for name, default in DEFAULT_INPUTS.items():
+        value = row.get(name)
+        try:
+            inputs[name] = default if value is None or value == "" else float(value)
+        except (TypeError, ValueError):
+            raise ValueError(
+                f"row {index + 1} (case {row.get('case') or index + 1}): '{name}' must be a number, got {value!r}"
+            ) from None
+    inputs['G_c'] = calculate_concrete_load(inputs['thickness'], inputs['reinforcement_percentage'])
+    return {
+        "index": index,
+        "case": str(row.get("case") or index + 1),
+        "project_number": str(row.get("project_number") or ""),
+        "project_name": str(row.get("project_name") or ""),
+        "inputs": inputs
+    }
+
+def iter_chunks(cases, chunk_size):
+    """Yield lists of at most `chunk_size` parsed cases."""
+    parsed = (parse_case(row, i) for i, row in enumerate(cases))
+    while True:
+        chunk = list(islice(parsed, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def _input_columns(chunk):
+    """Return the inputs of a chunk of parsed cases as one list per input, including G_c."""
+    return {name: [case["inputs"][name] for case in chunk] for name in [*DEFAULT_INPUTS, 'G_c']}
+
+def evaluate_chunk(chunk):
+    """Yield result rows for a chunk of parsed cases."""
+    columns = _input_columns(chunk)
+    for gamma_d in GAMMA_D_VALUES:
+        loads = compute_combinations_batch(columns, gamma_d)
+        for case, case_loads in zip(chunk, loads.tolist()):
+            for number, (stage, (vertical, horizontal)) in enumerate(zip(COMBINATION_STAGES, case_loads), start=1):
+                yield {
+                    "case": case["case"],
+                    "project_number": case["project_number"],
+                    "project_name": case["project_name"],
+                    "stage": int(stage),
+                    "combination": number,
+                    "gamma_d": gamma_d,
+                    "vertical": round(vertical, 6),
+                    "horizontal": round(horizontal, 6)
+                }
+
+def evaluate_chunk_columns(chunk):
+    """Return the results of a chunk of parsed cases as long-format column arrays.
+
+    The rows are those of evaluate_chunk, with unrounded loads.
+    """
+    columns = _input_columns(chunk)
+    loads = np.stack([compute_combinations_batch(columns, gamma_d) for gamma_d in GAMMA_D_VALUES])
+    return long_format_columns(loads, GAMMA_D_VALUES, COMBINATION_STAGES, {
+        "case": [case["case"] for case in chunk],
+        "project_number": [case["project_number"] for case in chunk],
+        "project_name": [case["project_name"] for case in chunk]
+    })
+
+class ResultWriter:
+    """Write result rows to a CSV or JSON Lines file, chosen by extension."""
+
+    def __init__(self, path):
+        self.ext = os.path.splitext(path)[1].lower()
+        if self.ext not in (".csv", ".jsonl", ".ndjson"):
+            raise ValueError(f"Unsupported output file type '{self.ext}'")
+        self.file = open(path, "w", newline='', encoding='utf-8')
+        if self.ext == ".csv":
+            self.writer = csv.DictWriter(self.file, fieldnames=RESULT_COLUMNS)
+            self.writer.writeheader()
+
+    def write(self, rows):
+        if self.ext == ".csv":
+            self.writer.writerows(rows)
+        else:
+            for row in rows:
+                self.file.write(json.dumps(row) + "\n")
+
+    def close(self):
+        self.file.close()
+
+def write_report(case, reports_dir):
+    """Write the PDF report of one case and return its path.
+
+    The file is named after the row number and the case name, as case names
+    need not be unique and may clash once sanitised for the file system.
+    """
+    from report import get_pdf_report
+    safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in case["case"])
+    path = os.path.join(reports_dir, f"Load_Combination_Report_{case['index'] + 1}_{safe_name}.pdf")
+    pdf = get_pdf_report(
+        case["inputs"],
+        get_results_table(case["inputs"]),
+        case["project_number"],
+        case["project_name"]
+    )
+    with open(path, "wb") as f:
+        f.write(pdf)
+    return path
+
+def init_report_worker():
+    """Build the report template and load the logo once per worker process."""
+    from report import get_report_template
+    from assets import get_logo
+    get_report_template()
+    get_logo()
+
+def generate_reports(cases, reports_dir, workers=None, max_pending=None, progress=None):
+    """Write a PDF report for each parsed case using a pool of worker processes.
+
+    Yields the report paths in the order of `cases`. At most `max_pending`
+    reports (default: twice the number of workers) are queued at a time, so
+    `cases` may be a long-running iterator. `progress`, if given, is called
+    with the number of reports completed so far. With `workers=1` the
+    reports are rendered in the calling process.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        init_report_worker()
+        for done, case in enumerate(cases, start=1):
+            yield write_report(case, reports_dir)
+            if progress:
+                progress(done)
+        return
+
+    max_pending = max_pending or 2 * workers
+    pending = deque()
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_report_worker) as executor:
+        for case in cases:
+            pending.append(executor.submit(write_report, case, reports_dir))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+                done += 1
+                if progress:
+                    progress(done)
+        while pending:
+            yield pending.popleft().result()
+            done += 1
+            if progress:
+                progress(done)
+
+def write_consolidated(cases, path, project_number="", project_name=""):
+    """Write one PDF report covering all parsed cases, one bay per case.
+
+    Cases are pulled from `cases` as the report is laid out, so it may be a
+    long-running iterator.
+    """
+    from report import write_consolidated_report
+    bays = (
+        (case["case"], case["inputs"], get_results_table(case["inputs"]))
+        for case in cases
+    )
+    write_consolidated_report(bays, project_number, project_name, path)
+    return path
+
+def open_result_writer(path):
+    """Return the writer for a results file: Parquet and Arrow files are written by column chunks."""
+    if os.path.splitext(path)[1].lower() in (".parquet", ".arrow", ".feather"):
+        return ArrowResultWriter(path)
+    return ResultWriter(path)
+
+def run_batch(input_path, out_path=None, reports_dir=None, chunk_size=10000, workers=1,
+              consolidated_path=None, project_number="", project_name=""):
+    """Process all cases of `input_path` and return the number of cases."""
+    writer = open_result_writer(out_path) if out_path else None
+    if reports_dir:
+        os.makedirs(reports_dir, exist_ok=True)
+    n_cases = 0
+
+    def evaluated_cases():
+        nonlocal n_cases
+        for chunk in iter_chunks(read_cases(input_path), chunk_size):
+            with span("batch_chunk"):
+                if isinstance(writer, ArrowResultWriter):
+                    writer.write(evaluate_chunk_columns(chunk))
+                elif writer:
+                    writer.write(evaluate_chunk(chunk))
+            n_cases += len(chunk)
+            yield from chunk
+
+    try:
+        cases = evaluated_cases()
+        if consolidated_path:
+            write_consolidated(cases, consolidated_path, project_number, project_name)
+        else:
+            if reports_dir:
+                cases = generate_reports(cases, reports_dir, workers)
+            for _ in cases:
+                pass
+    finally:
+        if writer:
+            writer.close()
+    return n_cases
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch load combinations to AS 3610.2 (Int):2023")
+    parser.add_argument("cases", help="CSV, JSON or JSON Lines file of load cases")
+    parser.add_argument("--out", help="results file (.csv, .jsonl, .parquet or .arrow)")
+    parser.add_argument("--reports", help="directory for per-case PDF reports")
+    parser.add_argument("--consolidated", help="single PDF report covering all cases, one bay per case")
+    parser.add_argument("--project-number", default="", help="project number of the consolidated report")
+    parser.add_argument("--project-name", default="", help="project name of the consolidated report")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="cases evaluated per chunk")
+    parser.add_argument("--workers", type=int, default=1, help="processes used to write PDF reports (0 = one per CPU)")
+    args = parser.parse_args(argv)
+
+    if not args.out and not args.reports and not args.consolidated:
+        parser.error("nothing to do: give --out, --reports and/or --consolidated")
+    if args.reports and args.consolidated:
+        parser.error("--reports and --consolidated cannot be combined")
+
+    try:
+        n_cases = run_batch(args.cases, args.out, args.reports, args.chunk_size, args.workers,
+                            args.consolidated, args.project_number, args.project_name)
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    write_metrics()
+    print(f"Processed {n_cases} load cases", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
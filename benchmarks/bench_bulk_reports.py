@@ -0,0 +1,41 @@
+"""Benchmark bulk PDF report generation: reports per second against worker count.
+
+    python benchmarks/bench_bulk_reports.py --reports 200 --workers 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("AS3610_LOGO_OFFLINE", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch import generate_reports, parse_case
+
+def make_cases(n, run):
+    # A project name per run keeps reports of earlier runs, cached by
+    # get_pdf_report in this process and inherited by forked workers, from being reused
+    return [
+        parse_case({"case": f"B{i}", "project_name": f"Benchmark run {run}", "thickness": 0.1 + 0.001 * i}, i)
+        for i in range(n)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reports", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    print(f"{'workers':>8} {'seconds':>9} {'reports/s':>10}")
+    for run, workers in enumerate(args.workers):
+        cases = make_cases(args.reports, run)
+        with tempfile.TemporaryDirectory() as reports_dir:
+            start = time.perf_counter()
+            for _ in generate_reports(cases, reports_dir, workers):
+                pass
+            elapsed = time.perf_counter() - start
+        print(f"{workers:>8} {elapsed:>9.2f} {args.reports / elapsed:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark peak memory of the consolidated multi-bay PDF report against bay count.
+
+Each measurement runs in a fresh process and reports its peak RSS. The
+"streamed" mode uses write_consolidated_report with a generator of bays,
+writing to a file; the "in-memory" mode builds all bays' results and
+flowables up front into a BytesIO, as a one-shot build would.
+
+    python benchmarks/bench_consolidated_memory.py --bays 10 100 500 1000
+"""
+import argparse
+import io
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("AS3610_LOGO_OFFLINE", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def make_bays(n):
+    from batch import parse_case
+    from engine import build_results_table
+    for i in range(n):
+        inputs = parse_case({"thickness": 0.1 + 0.001 * i}, i)["inputs"]
+        yield f"B{i + 1}", inputs, build_results_table(inputs)
+
+def run(mode, n_bays, path):
+    """Build one consolidated report and print the elapsed time and peak RSS."""
+    from reportlab.platypus import PageBreak, Paragraph
+    from report import get_report_template, write_consolidated_report
+    template = get_report_template()
+    start = time.perf_counter()
+    if mode == "streamed":
+        write_consolidated_report(make_bays(n_bays), "PRJ-001", "Benchmark", path)
+    else:
+        elements = template.title_elements("PRJ-001", "Benchmark")
+        for i, (name, inputs, results) in enumerate(make_bays(n_bays)):
+            if i:
+                elements.append(PageBreak())
+            elements.append(Paragraph(f"Bay: {name}", template.styles['heading1']))
+            elements += template.results_elements(inputs, results)
+        output = io.BytesIO()
+        template._doc(output).build(elements, onFirstPage=template.draw_header_footer,
+                                    onLaterPages=template.draw_header_footer)
+        with open(path, "wb") as f:
+            f.write(output.getvalue())
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in kilobytes on Linux
+    print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bays", type=int, nargs="+", default=[10, 100, 500, 1000])
+    parser.add_argument("--modes", nargs="+", default=["streamed", "in-memory"], choices=["streamed", "in-memory"])
+    parser.add_argument("--run", nargs=3, metavar=("MODE", "BAYS", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run(args.run[0], int(args.run[1]), args.run[2])
+        return
+
+    print(f"{'mode':>10} {'bays':>6} {'seconds':>8} {'peak RSS MB':>12} {'PDF MB':>7}")
+    for mode in args.modes:
+        for n_bays in args.bays:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "consolidated.pdf")
+                out = subprocess.run([sys.executable, __file__, "--run", mode, str(n_bays), path],
+                                     check=True, capture_output=True, text=True).stdout
+                elapsed, peak = map(float, out.split())
+                size = os.path.getsize(path) / 1024 / 1024
+            print(f"{mode:>10} {n_bays:>6} {elapsed:>8.2f} {peak:>12.1f} {size:>7.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Measure the cold import time of each module with `python -X importtime`.
+
+    python benchmarks/bench_import.py loads engine report batch app
+
+Each module is imported in a fresh interpreter; the cumulative import time
+reported for the module itself is printed, best of --repeat runs.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def import_time_us(module):
+    """Return the cumulative import time of `module` in microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    for line in reversed(result.stderr.splitlines()):
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise RuntimeError(f"no import time reported for {module}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=["loads", "engine", "assets", "report", "batch", "app"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'module':<10} {'import ms':>10}")
+    for module in args.modules:
+        best = min(import_time_us(module) for _ in range(args.repeat))
+        print(f"{module:<10} {best / 1000:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark loading the report logo when the logo hosts are slow or failing.
+
+Each scenario serves the primary and fallback logo from local stub servers
+and times a cold get_logo(), with or without a local copy of the logo. The
+last scenario times a get_logo() after the TTL of the cached logo has
+expired, which returns the cached logo and revalidates it in the background.
+
+    python benchmarks/bench_logo_fetch.py --slow 5 --timeout 2
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import assets
+from stub_server import make_logo_png, serve_logo
+
+def wait_for_refresh():
+    """Wait until a background refresh of the logo has finished."""
+    while assets._logo_cache["refreshing"]:
+        time.sleep(0.01)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slow", type=float, default=5.0, help="response delay of a slow host in seconds")
+    parser.add_argument("--timeout", type=float, default=2.0, help="assets.LOGO_TIMEOUT in seconds")
+    args = parser.parse_args()
+
+    scenarios = [
+        ("both hosts up", {}, {}, False),
+        ("primary slow", {"delay": args.slow}, {}, False),
+        ("primary drops connection", {"drop": True}, {}, False),
+        ("primary HTTP 500", {"status": 500}, {}, False),
+        ("both hosts down", {"status": 500}, {"drop": True}, False),
+        ("both hosts down, local copy", {"status": 500}, {"drop": True}, True),
+        ("both hosts slow, local copy", {"delay": args.slow}, {"delay": args.slow}, True),
+    ]
+    assets.LOGO_PATH, assets.LOGO_OFFLINE, assets.LOGO_TIMEOUT = "", False, args.timeout
+    with tempfile.TemporaryDirectory() as tmp:
+        assets.LOGO_LOCAL_COPY = os.path.join(tmp, "logo.png")
+
+        print(f"{'scenario':<30} {'seconds':>8} {'logo':>6}")
+        for name, primary, fallback, local_copy in scenarios:
+            if os.path.exists(assets.LOGO_LOCAL_COPY):
+                os.remove(assets.LOGO_LOCAL_COPY)
+            if local_copy:
+                with open(assets.LOGO_LOCAL_COPY, "wb") as f:
+                    f.write(make_logo_png())
+            with ExitStack() as stack:
+                assets.LOGO_URL = stack.enter_context(serve_logo(**primary))
+                assets.FALLBACK_LOGO_URL = stack.enter_context(serve_logo(**fallback))
+                assets.clear_logo_cache()
+                start = time.perf_counter()
+                logo = assets.get_logo()
+                elapsed = time.perf_counter() - start
+                wait_for_refresh()
+            print(f"{name:<30} {elapsed:>8.3f} {'yes' if logo else 'no':>6}")
+
+        with serve_logo() as url:
+            assets.LOGO_URL = assets.FALLBACK_LOGO_URL = url
+            assets.clear_logo_cache()
+            assets.get_logo()
+            wait_for_refresh()
+            assets.LOGO_CACHE_TTL = 0
+            start = time.perf_counter()
+            logo = assets.get_logo()
+            elapsed = time.perf_counter() - start
+            wait_for_refresh()
+            print(f"{'revalidation (304)':<30} {elapsed:>8.3f} {'yes' if logo else 'no':>6}   "
+                  f"{url.requests} requests, {url.not_modified} not modified")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark PDF report generation with a shared ReportTemplate against
+rebuilding the report from scratch, in time and allocated memory per report.
+
+"legacy" mirrors generate_pdf_report before ReportTemplate: styles rebuilt and
+every table cell a new Paragraph. "fresh" rebuilds the template per report and
+"shared" reuses the process-wide template.
+
+    python benchmarks/bench_report_template.py --reports 50
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("AS3610_LOGO_OFFLINE", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.platypus import Paragraph, Table
+
+from engine import build_results_table
+from loads import DEFAULT_INPUTS, calculate_concrete_load
+from report import INPUT_PARAMETERS, ReportTemplate, get_report_styles, get_report_template
+
+class LegacyTemplate(ReportTemplate):
+    """Report layout with a new Paragraph for every table cell."""
+
+    def _input_table(self, inputs):
+        cell, center = self.styles['table_cell'], self.styles['table_cell_center']
+        cells = [(Paragraph(label, cell), Paragraph(fmt.format(inputs[key]), center)) for key, label, fmt in INPUT_PARAMETERS]
+        rows = [["Parameter", "Value", "", "Parameter", "Value"]]
+        for i in range(0, len(cells), 2):
+            rows.append([*cells[i], "", *(cells[i+1] if i+1 < len(cells) else ("", ""))])
+        table = Table(rows, colWidths=self.input_col_widths)
+        table.setStyle(self.input_table_style)
+        return table
+
+    def _results_table(self, rows):
+        cell, center, header = self.styles['table_cell'], self.styles['table_cell_center'], self.styles['table_header']
+        table_rows = [[Paragraph("Combination", header), Paragraph("Vertical Load<br/>(kN/m²)", header),
+                       Paragraph("Horizontal Load<br/>(kN/m or kN/m²)", header)]]
+        for description, vertical, horizontal in zip(rows["description_html"], rows["vertical"], rows["horizontal"]):
+            table_rows.append([Paragraph(description, cell),
+                               Paragraph(f"{vertical:.2f}", center), Paragraph(f"{horizontal:.2f}", center)])
+        table = Table(table_rows, colWidths=self.results_col_widths)
+        table.setStyle(self.results_table_style)
+        return table
+
+def legacy_report(inputs, results):
+    get_report_styles.cache_clear()
+    return LegacyTemplate().build(inputs, results, "PRJ-001", "Sample Project")
+
+def fresh_template_report(inputs, results):
+    return ReportTemplate().build(inputs, results, "PRJ-001", "Sample Project")
+
+def shared_template_report(inputs, results):
+    return get_report_template().build(inputs, results, "PRJ-001", "Sample Project")
+
+def measure(func, inputs, results, n):
+    func(inputs, results)
+    start = time.perf_counter()
+    for _ in range(n):
+        func(inputs, results)
+    elapsed = (time.perf_counter() - start) / n
+
+    tracemalloc.start()
+    func(inputs, results)
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+    return elapsed, peak, blocks
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reports", type=int, default=50)
+    args = parser.parse_args()
+
+    inputs = dict(DEFAULT_INPUTS)
+    inputs['G_c'] = calculate_concrete_load(inputs['thickness'], inputs['reinforcement_percentage'])
+    results = build_results_table(inputs)
+
+    print(f"{'template':>10} {'ms/report':>10} {'peak kB':>9} {'live blocks':>12}")
+    timings = {}
+    for name, func in (("legacy", legacy_report), ("fresh", fresh_template_report), ("shared", shared_template_report)):
+        elapsed, peak, blocks = measure(func, inputs, results, args.reports)
+        timings[name] = elapsed
+        print(f"{name:>10} {elapsed * 1000:>10.1f} {peak / 1024:>9.0f} {blocks:>12}")
+    print(f"speed-up over legacy: {timings['legacy'] / timings['shared']:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Load test of the HTTP calculation service: latency percentiles and throughput.
+
+Starts a local instance of service.py unless --url is given, then sends
+requests from --clients concurrent clients for --duration seconds.
+
+    python benchmarks/loadtest_service.py --clients 16 --duration 10 --cases 1
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+
+os.environ.setdefault("AS3610_LOGO_OFFLINE", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def make_body(n_cases):
+    cases = [{"thickness": random.uniform(0.1, 1.5), "Q_m": random.uniform(1.0, 5.0)} for _ in range(n_cases)]
+    return json.dumps({"cases": cases}).encode()
+
+def client(url, n_cases, stop, latencies, errors):
+    while not stop.is_set():
+        request = urllib.request.Request(url, data=make_body(n_cases), headers={"Content-Type": "application/json"})
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+            latencies.append(time.perf_counter() - start)
+        except Exception:
+            errors.append(1)
+
+def percentile(values, q):
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1] if len(values) > 1 else values[0]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="base URL of a running service (default: start one locally)")
+    parser.add_argument("--endpoint", default="/envelope", choices=["/combinations", "/envelope"])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--cases", type=int, default=1, help="cases per request")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        from service import make_server
+        server = make_server(port=0, report_workers=1)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    stop = threading.Event()
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(target=client, args=(base_url + args.endpoint, args.cases, stop, latencies, errors))
+        for _ in range(args.clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    if server:
+        batches = server.service.batcher.batches
+        server.shutdown()
+        server.server_close()
+        server.service.close()
+
+    if not latencies:
+        print(f"no successful requests ({len(errors)} errors)")
+        return
+    print(f"requests:   {len(latencies)} ok, {len(errors)} errors in {elapsed:.1f} s")
+    print(f"throughput: {len(latencies) / elapsed:.0f} req/s, {len(latencies) * args.cases / elapsed:.0f} cases/s")
+    print(f"latency:    p50 {percentile(latencies, 50) * 1000:.2f} ms, p99 {percentile(latencies, 99) * 1000:.2f} ms")
+    if server:
+        print(f"batches:    {batches} ({len(latencies) / max(batches, 1):.1f} requests per batch)")
+
+if __name__ == "__main__":
+    main()
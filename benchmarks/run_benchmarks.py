@@ -0,0 +1,162 @@
+"""Benchmark suite for the calculation, results table, PDF and app rerun paths.
+
+Results are written as JSON so runs of different versions can be compared:
+
+    python benchmarks/run_benchmarks.py --output bench-new.json --compare bench-old.json
+
+The PDF benchmarks fetch the logo from a local stub server instead of the
+real logo hosts. Use --only to run a subset, e.g. --only pdf.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+import assets
+import engine
+import loads
+import report
+from stub_server import serve_logo
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+def timed(func, rounds, warmup=1):
+    """Call `func` `rounds` times and return timing statistics in seconds."""
+    for _ in range(warmup):
+        func()
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {
+        "rounds": rounds,
+        "mean_s": statistics.fmean(times),
+        "min_s": min(times),
+        "stdev_s": statistics.stdev(times) if rounds > 1 else 0.0
+    }
+
+def default_inputs():
+    inputs = dict(loads.DEFAULT_INPUTS)
+    inputs['G_c'] = loads.calculate_concrete_load(inputs['thickness'], inputs['reinforcement_percentage'])
+    return inputs
+
+def bench_calculation(rounds):
+    inputs = default_inputs()
+    rng = np.random.default_rng(0)
+    cases = {name: rng.uniform(0.0, 3.0, 100_000) for name in loads.DEFAULT_INPUTS}
+    return {
+        "calculate_concrete_load": timed(lambda: loads.calculate_concrete_load(0.2, 2.0), rounds * 1000),
+        "compute_combinations": timed(lambda: [
+            loads.compute_combinations(inputs['G_f'], inputs['G_c'], inputs[f'Q_w{stage}'], inputs['Q_m'],
+                                     inputs['Q_h'], inputs['W_s'], inputs['W_u'], inputs['F_w'], inputs['Q_x'],
+                                     inputs['P_c'], inputs['I'], stage, gamma_d)
+            for stage in "123" for gamma_d in loads.GAMMA_D_VALUES
+        ], rounds * 100),
+        "compute_combinations_batch_100k": timed(lambda: engine.compute_combinations_batch(cases, 1.3), rounds),
+        "compute_envelope_100k": timed(lambda: engine.compute_envelope(cases), rounds),
+    }
+
+def bench_dataframe(rounds):
+    from app import create_results_dataframe
+    inputs = default_inputs()
+    results = engine.build_results_table(inputs)
+    return {
+        "build_results_table": timed(lambda: engine.build_results_table(inputs), rounds * 10),
+        "create_results_dataframe": timed(lambda: [
+            create_results_dataframe(results, stage, gamma_d)
+            for stage in loads.STAGE_DESCRIPTIONS for gamma_d in loads.GAMMA_D_VALUES
+        ], rounds * 10),
+    }
+
+def bench_pdf(rounds):
+    inputs = default_inputs()
+    results = engine.build_results_table(inputs)
+    def warm_logo_report():
+        report.generate_pdf_report(inputs, results, "PRJ-001", "Sample Project")
+
+    def cold_logo_report():
+        assets.clear_logo_cache()
+        warm_logo_report()
+
+    with serve_logo() as url, tempfile.TemporaryDirectory() as tmp:
+        assets.LOGO_URL, assets.FALLBACK_LOGO_URL, assets.LOGO_PATH, assets.LOGO_OFFLINE = url, url, "", False
+        # Keep the downloaded logo out of the source tree
+        assets.LOGO_LOCAL_COPY = os.path.join(tmp, "logo.png")
+        assets.clear_logo_cache()
+        return {
+            "generate_pdf_report": timed(warm_logo_report, rounds),
+            "generate_pdf_report_cold_logo": timed(cold_logo_report, rounds),
+        }
+
+def bench_rerun(rounds):
+    from streamlit.testing.v1 import AppTest
+    os.environ["AS3610_LOGO_OFFLINE"] = "1"
+    at = AppTest.from_file(APP_PATH, default_timeout=60).run()
+    at.sidebar.button[0].click().run()
+
+    def calculate():
+        at.sidebar.button[0].click().run()
+
+    return {
+        "main_rerun": timed(lambda: at.run(), rounds),
+        "main_rerun_calculate": timed(calculate, rounds),
+    }
+
+SUITES = {
+    "calculation": bench_calculation,
+    "dataframe": bench_dataframe,
+    "pdf": bench_pdf,
+    "rerun": bench_rerun,
+}
+
+def compare(results, baseline_path):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    print(f"\n{'benchmark':<36} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for name, stats in results.items():
+        if name in baseline:
+            old, new = baseline[name]["mean_s"], stats["mean_s"]
+            print(f"{name:<36} {old * 1e3:>10.3f}ms {new * 1e3:>10.3f}ms {new / old:>7.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--only", nargs="+", choices=sorted(SUITES), help="suites to run")
+    parser.add_argument("--output", help="JSON file for the results")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare against")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.only or SUITES:
+        results.update(SUITES[name](args.rounds))
+
+    print(f"{'benchmark':<36} {'mean':>12} {'min':>12} {'rounds':>7}")
+    for name, stats in results.items():
+        print(f"{name:<36} {stats['mean_s'] * 1e3:>10.3f}ms {stats['min_s'] * 1e3:>10.3f}ms {stats['rounds']:>7}")
+
+    if args.output:
+        record = {
+            "version": loads.PROGRAM_VERSION,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "results": results
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Local stand-in for the logo hosts, used by the benchmarks.
+
+    with serve_logo() as url:
+        assets.LOGO_URL = url
+"""
+import io
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+def make_logo_png(width=400, height=150):
+    """Return the bytes of a plain PNG image to serve as the logo."""
+    from PIL import Image
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (32, 64, 128)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+@contextmanager
+def serve_logo(body=None, status=200, delay=0.0, drop=False, etag='"logo-v1"'):
+    """Serve `body` (a generated PNG by default) on a local port and yield its URL.
+
+    Every response waits `delay` seconds and returns `status`, to simulate
+    slow or failing hosts; with `drop` the connection is closed without a
+    response. Successful responses carry `etag` and a conditional request
+    with a matching If-None-Match gets 304 Not Modified. The request and 304
+    counts are available as `url.requests` and `url.not_modified`.
+    """
+    body = make_logo_png() if body is None else body
+    counter = {"requests": 0, "not_modified": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            counter["requests"] += 1
+            if delay:
+                time.sleep(delay)
+            if drop:
+                self.close_connection = True
+                return
+            if status == 200 and etag and self.headers.get("If-None-Match") == etag:
+                counter["not_modified"] += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(status)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(body) if status == 200 else 0))
+            if status == 200 and etag:
+                self.send_header("ETag", etag)
+            self.end_headers()
+            if status == 200:
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up on a slow response
+                    pass
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield StubURL(f"http://127.0.0.1:{server.server_address[1]}/logo.png", counter)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+class StubURL(str):
+    """URL of a stub server that also reports how many requests it received."""
+
+    def __new__(cls, url, counter):
+        obj = super().__new__(cls, url)
+        obj._counter = counter
+        return obj
+
+    @property
+    def requests(self):
+        return self._counter["requests"]
+
+    @property
+    def not_modified(self):
+        return self._counter["not_modified"]
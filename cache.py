@@ -0,0 +1,167 @@
+"""Content-addressed cache of calculation results and rendered reports.
+
+Entries are keyed on a canonical hash of the inputs plus PROGRAM_VERSION, so
+identical cases computed by different sessions share one entry. The cache
+has an in-memory LRU tier per process and an optional SQLite tier on disk
+shared by all processes using the same directory. Both tiers are bounded by
+total size in bytes.
+
+    AS3610_CACHE_DIR        directory of the on-disk tier (off when unset)
+    AS3610_CACHE_MEMORY_MB  size of the in-memory tier (default 64)
+    AS3610_CACHE_DISK_MB    size of the on-disk tier (default 512)
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from loads import PROGRAM_VERSION
+
+CACHE_DIR = os.environ.get("AS3610_CACHE_DIR", "")
+CACHE_MEMORY_BYTES = int(float(os.environ.get("AS3610_CACHE_MEMORY_MB", 64)) * 1024 * 1024)
+CACHE_DISK_BYTES = int(float(os.environ.get("AS3610_CACHE_DISK_MB", 512)) * 1024 * 1024)
+
+def _canonical(value):
+    """Convert numbers to float so that e.g. 1 and 1.0 hash the same."""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    return float(value)
+
+def cache_key(kind, inputs, **extra):
+    """Return the content hash of an entry of `kind` for an inputs dict.
+
+    PROGRAM_VERSION is always part of the key; `extra` holds anything else
+    the entry depends on, such as project details of a report.
+    """
+    payload = json.dumps({
+        "kind": kind,
+        "version": PROGRAM_VERSION,
+        "inputs": _canonical(inputs),
+        "extra": extra
+    }, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def report_cache_key(inputs, project_number, project_name):
+    """Return the cache key of the PDF report for these inputs and project details.
+
+    The report date is part of the key, so a cached report is never served
+    with a stale date.
+    """
+    return cache_key(
+        "report", inputs,
+        project_number=project_number,
+        project_name=project_name,
+        date=datetime.now().strftime('%Y-%m-%d')
+    )
+
+class ResultCache:
+    """Two-tier (memory, optional SQLite) cache of bytes values keyed by content hash."""
+
+    def __init__(self, memory_bytes=CACHE_MEMORY_BYTES, path=None, disk_bytes=CACHE_DISK_BYTES):
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.path = path
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._lock = threading.Lock()
+        self._db = None
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "memory_evictions": 0, "disk_evictions": 0}
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+
+    def get(self, key):
+        """Return the cached bytes for `key`, or None."""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                return data
+            if self._db is not None:
+                row = self._db.execute("SELECT data FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+                    self.counters["disk_hits"] += 1
+                    self._put_memory(key, row[0])
+                    return row[0]
+            self.counters["misses"] += 1
+            return None
+
+    def put(self, key, data):
+        """Store `data` (bytes) under `key` in both tiers."""
+        data = bytes(data)
+        with self._lock:
+            self._put_memory(key, data)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries (key, data, size, accessed) VALUES (?, ?, ?, ?)",
+                    (key, data, len(data), time.time())
+                )
+                self._evict_disk()
+
+    def _put_memory(self, key, data):
+        if key in self._memory:
+            self._memory_size -= len(self._memory.pop(key))
+        if len(data) > self.memory_bytes:
+            return
+        self._memory[key] = data
+        self._memory_size += len(data)
+        while self._memory_size > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+            self.counters["memory_evictions"] += 1
+
+    def _evict_disk(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.disk_bytes:
+            return
+        freed = 0
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall():
+            if total - freed <= self.disk_bytes:
+                break
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            freed += size
+            self.counters["disk_evictions"] += 1
+
+    def stats(self):
+        """Return the hit/miss counters and the size of each tier."""
+        with self._lock:
+            stats = dict(self.counters, memory_entries=len(self._memory), memory_size=self._memory_size)
+            if self._db is not None:
+                entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+                stats.update(disk_entries=entries, disk_size=size)
+            return stats
+
+    def clear(self):
+        """Remove all entries from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_size = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM entries")
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """Return the process-wide ResultCache configured from the environment."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            path = os.path.join(CACHE_DIR, "as3610_cache.sqlite3") if CACHE_DIR else None
+            _cache = ResultCache(CACHE_MEMORY_BYTES, path, CACHE_DISK_BYTES)
+        return _cache
@@ -0,0 +1,305 @@
+"""Vectorized evaluation of the load combinations with NumPy.
+
+Batch evaluation, governing-combination envelopes, parametric sweeps and the
+numeric results table. pandas, SciPy and matplotlib are imported only by the
+functions that need them.
+"""
+import functools
+
+import numpy as np
+
+from instrumentation import timed
+from loads import (
+    COMBINATION_DESCRIPTIONS, COMBINATION_DESCRIPTIONS_PLAIN, COMBINATION_RULES, COMBINATION_STAGES,
+    GAMMA_D_VALUES, STAGE_DESCRIPTIONS, calculate_concrete_load
+)
+
+# Actions in the column order used by the batch engine. Q_w is split per stage
+# so all 12 combinations can be evaluated in a single matrix product.
+BATCH_ACTIONS = ("G_f", "G_c", "Q_w1", "Q_w2", "Q_w3", "Q_m", "Q_h", "W_s", "W_u", "F_w", "Q_x", "P_c", "I")
+
+def factor_matrices(rules):
+    """Compile combination rules (see loads.COMBINATION_RULES) into coefficient matrices.
+
+    Returns the vertical and horizontal factors, one row per combination and
+    columns as BATCH_ACTIONS, and a boolean array of the combinations scaled
+    by γ_d. The Q_w factor of a rule goes into the column of its stage.
+    """
+    vertical = np.zeros((len(rules), len(BATCH_ACTIONS)))
+    horizontal = np.zeros_like(vertical)
+    for row, (_, stage, vertical_factors, horizontal_factors, _) in enumerate(rules):
+        for matrix, factors in ((vertical, vertical_factors), (horizontal, horizontal_factors)):
+            for action, factor in factors.items():
+                matrix[row, BATCH_ACTIONS.index(f"Q_w{stage}" if action == "Q_w" else action)] = factor
+    gamma_d_applies = np.array([rule[4] for rule in rules])
+    return vertical, horizontal, gamma_d_applies
+
+# Table 3.3.1 factors and the combinations that are scaled by gamma_d
+VERTICAL_FACTORS, HORIZONTAL_FACTORS, GAMMA_D_APPLIES = factor_matrices(COMBINATION_RULES)
+
+def _batch_input_matrix(cases):
+    """Build the (n_cases x len(BATCH_ACTIONS)) input matrix from column arrays.
+
+    `cases` is a mapping of column name to array (dict of arrays or a pandas
+    DataFrame). A single "Q_w" column is used for all three stages when the
+    per-stage Q_w1/Q_w2/Q_w3 columns are not given, and G_c is calculated from
+    thickness and reinforcement_percentage when it is not given.
+    """
+    columns = {}
+    for name in BATCH_ACTIONS:
+        if name in cases:
+            columns[name] = cases[name]
+        elif name.startswith("Q_w") and "Q_w" in cases:
+            columns[name] = cases["Q_w"]
+        elif name == "G_c" and "thickness" in cases and "reinforcement_percentage" in cases:
+            columns[name] = calculate_concrete_load(
+                np.asarray(cases["thickness"], dtype=float),
+                np.asarray(cases["reinforcement_percentage"], dtype=float)
+            )
+        else:
+            raise KeyError(f"Missing input column '{name}'")
+    return np.column_stack([np.asarray(columns[name], dtype=float).reshape(-1) for name in BATCH_ACTIONS])
+
+def compute_combinations_batch(cases, gamma_d):
+    """Compute all 12 load combinations for many load cases at once.
+
+    Returns an array of shape (n_cases, 12, 2) holding the vertical and
+    horizontal load of combinations 1-12 for each case. `gamma_d` may be a
+    scalar or an array with one value per case.
+    """
+    X = _batch_input_matrix(cases)
+    scale = np.where(GAMMA_D_APPLIES, np.asarray(gamma_d, dtype=float).reshape(-1, 1), 1.0)
+    out = np.empty((X.shape[0], len(COMBINATION_STAGES), 2))
+    out[:, :, 0] = X @ VERTICAL_FACTORS.T * scale
+    out[:, :, 1] = X @ HORIZONTAL_FACTORS.T * scale
+    return out
+
+# Combinations affected by each action (rows as combinations, columns as BATCH_ACTIONS)
+COMBINATION_DEPENDENCIES = (VERTICAL_FACTORS != 0) | (HORIZONTAL_FACTORS != 0)
+
+def _governing(loads, gamma_d_values):
+    """Find the governing and ranked combinations of an (n, n_gamma, 12) load array."""
+    n = loads.shape[0]
+    flat = loads.reshape(n, -1)
+    ranking = np.argsort(-flat, axis=1, kind='stable')
+    top = ranking[:, 0]
+    gamma_index, combination_index = np.divmod(top, loads.shape[2])
+    governing = {
+        "value": flat[np.arange(n), top],
+        "stage": np.asarray(COMBINATION_STAGES)[combination_index],
+        "combination": combination_index + 1,
+        "gamma_d": np.asarray(gamma_d_values, dtype=float)[gamma_index]
+    }
+    return governing, np.stack(np.divmod(ranking, loads.shape[2]), axis=-1)
+
+def _envelope(base_vertical, base_horizontal, gamma_d_values):
+    scale = np.where(GAMMA_D_APPLIES, np.asarray(gamma_d_values, dtype=float).reshape(-1, 1), 1.0)
+    loads = np.stack([
+        base_vertical[:, None, :] * scale,
+        base_horizontal[:, None, :] * scale
+    ], axis=-1)
+    vertical, vertical_ranking = _governing(loads[..., 0], gamma_d_values)
+    horizontal, horizontal_ranking = _governing(loads[..., 1], gamma_d_values)
+    return {
+        "loads": loads,
+        "vertical": vertical,
+        "horizontal": horizontal,
+        "vertical_ranking": vertical_ranking,
+        "horizontal_ranking": horizontal_ranking
+    }
+
+@timed()
+def compute_envelope(cases, gamma_d_values=GAMMA_D_VALUES):
+    """Find the governing vertical and horizontal combinations of many load cases.
+
+    All stages and γ_d values are evaluated in one pass. Returns a dict with:
+
+    - "loads": array (n_cases, len(gamma_d_values), 12, 2) of all loads
+    - "vertical" / "horizontal": dicts of arrays "value", "stage",
+      "combination" (1-12) and "gamma_d" of the governing combination
+    - "vertical_ranking" / "horizontal_ranking": int arrays
+      (n_cases, len(gamma_d_values) * 12, 2) of (γ_d index, combination
+      index) pairs ordered from the largest to the smallest load
+    """
+    X = _batch_input_matrix(cases)
+    return _envelope(X @ VERTICAL_FACTORS.T, X @ HORIZONTAL_FACTORS.T, gamma_d_values)
+
+class EnvelopeSolver:
+    """Incremental envelope of a single set of inputs.
+
+    Each call to update() only recomputes the combinations that depend on the
+    inputs changed since the previous call; the indices of those combinations
+    are kept in `affected`.
+    """
+
+    def __init__(self, gamma_d_values=GAMMA_D_VALUES):
+        self.gamma_d_values = gamma_d_values
+        self.x = None
+        self.base_vertical = np.zeros(len(COMBINATION_STAGES))
+        self.base_horizontal = np.zeros(len(COMBINATION_STAGES))
+        self.affected = np.arange(len(COMBINATION_STAGES))
+        self.envelope = None
+
+    def update(self, inputs):
+        """Update the envelope for a new inputs dict and return it."""
+        x = _batch_input_matrix(inputs)[0]
+        if self.x is None:
+            self.affected = np.arange(len(COMBINATION_STAGES))
+        else:
+            self.affected = np.flatnonzero(COMBINATION_DEPENDENCIES[:, x != self.x].any(axis=1))
+        if self.envelope is None or len(self.affected):
+            self.base_vertical[self.affected] = VERTICAL_FACTORS[self.affected] @ x
+            self.base_horizontal[self.affected] = HORIZONTAL_FACTORS[self.affected] @ x
+            self.envelope = _envelope(self.base_vertical[None], self.base_horizontal[None], self.gamma_d_values)
+        self.x = x
+        return self.envelope
+
+def sweep_points(ranges, method="grid", samples=100, seed=None):
+    """Return a function mapping point indices to swept parameter values, and the number of points.
+
+    `ranges` maps parameter names to (low, high, steps). A grid sweep takes
+    `steps` evenly spaced values of each parameter and covers every
+    combination of them; a Latin hypercube sweep draws `samples` points and
+    ignores `steps`. Points are generated on demand so a large grid is never
+    held in memory at once.
+    """
+    names = list(ranges)
+    lows = np.array([ranges[name][0] for name in names], dtype=float)
+    highs = np.array([ranges[name][1] for name in names], dtype=float)
+    if method == "grid":
+        steps = [max(int(ranges[name][2]), 1) for name in names]
+        axes = [np.linspace(low, high, n) for low, high, n in zip(lows, highs, steps)]
+        def points(index):
+            return np.column_stack([axis[i] for axis, i in zip(axes, np.unravel_index(index, steps))])
+        return points, int(np.prod(steps))
+    if method == "lhs":
+        from scipy.stats import qmc
+        unit = qmc.LatinHypercube(d=len(names), seed=seed).random(samples)
+        values = lows + unit * (highs - lows)
+        return (lambda index: values[index]), samples
+    raise ValueError(f"Unknown sweep method '{method}'")
+
+def run_sweep(base_inputs, ranges, method="grid", samples=100, chunk_size=4096, seed=None, gamma_d_values=GAMMA_D_VALUES):
+    """Evaluate all combinations over a parametric sweep of the inputs, chunk by chunk.
+
+    Parameters not in `ranges` keep their value from `base_inputs`; G_c is
+    recalculated from thickness and reinforcement percentage for every point.
+    Yields (start, params, loads) per chunk, where params is a float32 array
+    (n, len(ranges)) of swept values and loads a float32 array
+    (n, len(gamma_d_values), 12, 2) as in compute_envelope.
+    """
+    points, n_points = sweep_points(ranges, method, samples, seed)
+    base = {name: value for name, value in base_inputs.items() if name != 'G_c'}
+    for start in range(0, n_points, chunk_size):
+        index = np.arange(start, min(start + chunk_size, n_points))
+        params = points(index)
+        cases = {name: np.full(len(index), value, dtype=float) for name, value in base.items()}
+        for column, name in enumerate(ranges):
+            cases[name] = params[:, column]
+        loads = compute_envelope(cases, gamma_d_values)["loads"]
+        yield start, params.astype(np.float32), loads.astype(np.float32)
+
+def sweep(base_inputs, ranges, method="grid", samples=100, chunk_size=4096, seed=None):
+    """Run a full sweep and return the (params, loads) float32 arrays of all points."""
+    chunks = list(run_sweep(base_inputs, ranges, method, samples, chunk_size, seed))
+    if not chunks:
+        return np.empty((0, len(ranges)), dtype=np.float32), np.empty((0, len(GAMMA_D_VALUES), 12, 2), dtype=np.float32)
+    return np.concatenate([c[1] for c in chunks]), np.concatenate([c[2] for c in chunks])
+
+@functools.lru_cache(maxsize=None)
+def _results_layout(gamma_d_values):
+    """Row order, static columns and row slices of the results table for the given γ_d values.
+
+    The rows of each stage and γ_d are contiguous; `slices` maps
+    (stage, gamma_d) to the slice of those rows.
+    """
+    rows = []
+    slices = {}
+    for stage in STAGE_DESCRIPTIONS:
+        for g, gamma_d in enumerate(gamma_d_values):
+            start = len(rows)
+            rows += [(g, c) for c in range(len(COMBINATION_STAGES)) if COMBINATION_STAGES[c] == stage]
+            slices[(stage, gamma_d)] = slice(start, len(rows))
+    import pandas as pd
+    gamma_index = np.array([g for g, _ in rows])
+    combination_index = np.array([c for _, c in rows])
+    static = pd.DataFrame({
+        "stage": np.array(COMBINATION_STAGES, dtype=np.int8)[combination_index],
+        "combination": (combination_index + 1).astype(np.int8),
+        "gamma_d": np.asarray(gamma_d_values, dtype=float)[gamma_index],
+        "description": pd.Categorical(np.array(COMBINATION_DESCRIPTIONS_PLAIN)[combination_index]),
+        "description_html": pd.Categorical(np.array(COMBINATION_DESCRIPTIONS)[combination_index])
+    })
+    return gamma_index, combination_index, static, slices
+
+def results_rows(stage, gamma_d, gamma_d_values=GAMMA_D_VALUES):
+    """Return the slice of the results table rows of one stage and γ_d."""
+    return _results_layout(tuple(gamma_d_values))[3][(str(stage), gamma_d)]
+
+def results_table_from_loads(loads, gamma_d_values=GAMMA_D_VALUES):
+    """Build the results table from a (len(gamma_d_values), 12, 2) load array.
+
+    One row per stage, γ_d and combination, ordered by stage, then γ_d as
+    given, then combination. Columns: stage (int8), combination (int8),
+    gamma_d, vertical and horizontal (float64), and the plain and HTML
+    combination descriptions (categorical).
+    """
+    gamma_index, combination_index, static, _ = _results_layout(tuple(gamma_d_values))
+    table = static.copy(deep=False)
+    table.insert(3, "vertical", loads[gamma_index, combination_index, 0])
+    table.insert(4, "horizontal", loads[gamma_index, combination_index, 1])
+    return table
+
+def build_results_table(inputs, gamma_d_values=GAMMA_D_VALUES):
+    """Compute all combinations of one set of inputs as a results table."""
+    return results_table_from_loads(compute_envelope(inputs, gamma_d_values)["loads"][0], gamma_d_values)
+
+def get_results_loads(inputs, gamma_d_values=GAMMA_D_VALUES):
+    """Return the (len(gamma_d_values), 12, 2) loads of one set of inputs, shared through the result cache."""
+    from cache import cache_key, get_cache
+    cache = get_cache()
+    key = cache_key("results", inputs, gamma_d_values=list(gamma_d_values))
+    data = cache.get(key)
+    if data is None:
+        loads = compute_envelope(inputs, gamma_d_values)["loads"][0]
+        cache.put(key, loads.tobytes())
+        return loads
+    return np.frombuffer(data).reshape(len(gamma_d_values), len(COMBINATION_STAGES), 2)
+
+def get_results_table(inputs, gamma_d_values=GAMMA_D_VALUES):
+    """Return the results table of one set of inputs, shared through the result cache."""
+    return results_table_from_loads(get_results_loads(inputs, gamma_d_values), gamma_d_values)
+
+def plot_sweep(params, loads, names, combination=None, direction=0):
+    """Plot the governing envelope of a sweep against the first swept parameter.
+
+    The envelope is the largest load over all combinations and γ_d values;
+    `combination` (1-12) adds that combination at the critical γ_d. With a
+    second swept parameter, points are coloured by its value. `direction` is
+    0 for vertical and 1 for horizontal loads.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots(figsize=(8, 4.5))
+    x = params[:, 0]
+    order = np.argsort(x, kind='stable')
+    envelope = loads[..., direction].max(axis=(1, 2))
+    series = [("Governing envelope", envelope)]
+    if combination:
+        series.append((f"Combination {combination}", loads[:, 0, combination - 1, direction]))
+
+    for (label, y), marker in zip(series, ("o", "s")):
+        if params.shape[1] > 1:
+            points = ax.scatter(x, y, c=params[:, 1], s=12, marker=marker, label=label, cmap="viridis")
+        else:
+            ax.plot(x[order], y[order], marker=marker, markersize=3, label=label)
+    if params.shape[1] > 1:
+        fig.colorbar(points, ax=ax, label=names[1])
+
+    ax.set_xlabel(names[0])
+    ax.set_ylabel("Vertical load (kN/m²)" if direction == 0 else "Horizontal load (kN/m or kN/m²)")
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+    fig.tight_layout()
+    return fig
@@ -0,0 +1,112 @@
+"""Machine-readable export of load combination results: Parquet, Arrow and CSV.
+
+Results are exported in long format, one row per case, stage, combination and
+γ_d, with numeric columns. pyarrow is only needed for Parquet and Arrow and
+is imported when one of those formats is written.
+"""
+import io
+import os
+
+import numpy as np
+
+# Output formats by file extension
+EXPORT_FORMATS = {
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".csv": "csv"
+}
+
+# Columns of the results table (see engine.results_table_from_loads) that are exported
+TABLE_EXPORT_COLUMNS = ["stage", "combination", "gamma_d", "vertical", "horizontal", "description"]
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet and Arrow export need pyarrow (pip install pyarrow)") from None
+    return pyarrow
+
+def export_format(path):
+    """Return the export format of a file name from its extension."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export file type '{ext}'")
+    return EXPORT_FORMATS[ext]
+
+class ArrowResultWriter:
+    """Write column chunks to a Parquet or Arrow IPC file, one row group or record batch per chunk.
+
+    write() takes a dict of equal-length arrays. Numeric NumPy arrays are
+    handed to Arrow without copying; the schema is taken from the first chunk.
+    """
+
+    def __init__(self, path, fmt=None):
+        self.path = path
+        self.format = fmt or export_format(path)
+        if self.format not in ("parquet", "arrow"):
+            raise ValueError(f"ArrowResultWriter cannot write '{self.format}' files")
+        self.pa = _pyarrow()
+        self.writer = None
+
+    def write(self, columns):
+        batch = self.pa.RecordBatch.from_pydict(columns)
+        if self.writer is None:
+            if self.format == "parquet":
+                self.writer = self.pa.parquet.ParquetWriter(self.path, batch.schema, compression="zstd")
+            else:
+                self.writer = self.pa.ipc.new_file(self.path, batch.schema)
+        if self.format == "parquet":
+            self.writer.write_batch(batch)
+        else:
+            self.writer.write(batch)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+def export_results_table(results, fmt):
+    """Return the bytes of a results table (see engine.results_table_from_loads) in `fmt`.
+
+    `fmt` is "parquet", "arrow" or "csv". The HTML descriptions are left out;
+    stage and combination keep their int8 type and the descriptions are
+    written as a dictionary-encoded column.
+    """
+    table = results[TABLE_EXPORT_COLUMNS]
+    if fmt == "csv":
+        return table.to_csv(index=False, float_format="%.6f").encode()
+    pa = _pyarrow()
+    arrow_table = pa.Table.from_pandas(table, preserve_index=False)
+    sink = io.BytesIO()
+    if fmt == "parquet":
+        pa.parquet.write_table(arrow_table, sink, compression="zstd")
+    elif fmt == "arrow":
+        with pa.ipc.new_file(sink, arrow_table.schema) as writer:
+            writer.write_table(arrow_table)
+    else:
+        raise ValueError(f"Unsupported export format '{fmt}'")
+    return sink.getvalue()
+
+def long_format_columns(loads, gamma_d_values, stages, case_columns):
+    """Arrange a (n_gamma_d, n_cases, 12, 2) load array as long-format columns.
+
+    Rows are ordered by γ_d, then case, then combination. `case_columns` maps
+    column names to one value per case (e.g. case name and project details),
+    repeated for each of that case's rows. The vertical and horizontal loads
+    are each gathered into one contiguous array, which Arrow then uses as is.
+    """
+    n_gamma, n_cases, n_combinations, _ = loads.shape
+    columns = {
+        name: np.tile(np.repeat(np.asarray(values), n_combinations), n_gamma)
+        for name, values in case_columns.items()
+    }
+    columns.update({
+        "stage": np.tile(np.asarray(stages, dtype=np.int8), n_gamma * n_cases),
+        "combination": np.tile(np.arange(1, n_combinations + 1, dtype=np.int8), n_gamma * n_cases),
+        "gamma_d": np.repeat(np.asarray(gamma_d_values, dtype=float), n_cases * n_combinations),
+        "vertical": np.ascontiguousarray(loads[..., 0]).reshape(-1),
+        "horizontal": np.ascontiguousarray(loads[..., 1]).reshape(-1)
+    })
+    return columns
@@ -0,0 +1,171 @@
+"""Timing spans for the calculation and report pipeline, off by default.
+
+Wrap code in `with span("name"):` or decorate functions with `@timed("name")`.
+When instrumentation is enabled each span is logged as one JSON line on the
+"as3610.spans" logger and counted in Prometheus-style counters and duration
+histograms, which render_metrics() returns in the text exposition format.
+When it is disabled a span costs one flag check.
+
+    AS3610_INSTRUMENT=1          enable instrumentation
+    AS3610_TRACE_LOG=spans.jsonl also append the span log to this file (enables)
+    AS3610_METRICS_PATH=app.prom write the metrics to this file on write_metrics() (enables)
+
+Uses only the standard library, like loads.py.
+"""
+import functools
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+TRACE_LOG = os.environ.get("AS3610_TRACE_LOG", "")
+METRICS_PATH = os.environ.get("AS3610_METRICS_PATH", "")
+ENABLED = bool(TRACE_LOG or METRICS_PATH) or os.environ.get("AS3610_INSTRUMENT", "").lower() in ("1", "true", "yes")
+
+# Upper bounds of the duration histogram buckets, in seconds
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+logger = logging.getLogger("as3610.spans")
+
+_metrics = {}
+_metrics_lock = threading.Lock()
+
+def enable(trace_log=None):
+    """Turn instrumentation on, optionally appending the span log to `trace_log`."""
+    global ENABLED
+    ENABLED = True
+    if trace_log:
+        handler = logging.FileHandler(trace_log, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+
+def disable():
+    """Turn instrumentation off; recorded metrics are kept."""
+    global ENABLED
+    ENABLED = False
+
+def record(name, seconds, error=False, **labels):
+    """Add one finished span to the metrics and the span log."""
+    key = (name, tuple(sorted(labels.items())))
+    with _metrics_lock:
+        metric = _metrics.get(key)
+        if metric is None:
+            metric = _metrics[key] = {"count": 0, "errors": 0, "sum": 0.0, "buckets": [0] * len(DURATION_BUCKETS)}
+        metric["count"] += 1
+        metric["errors"] += error
+        metric["sum"] += seconds
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if seconds <= bound:
+                metric["buckets"][i] += 1
+                break
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({
+            "time": time.time(),
+            "span": name,
+            "duration_ms": round(seconds * 1000, 3),
+            "status": "error" if error else "ok",
+            "pid": os.getpid(),
+            "thread": threading.current_thread().name,
+            **labels
+        }))
+
+@contextmanager
+def _span(name, labels):
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        record(name, time.perf_counter() - start, error=True, **labels)
+        raise
+    record(name, time.perf_counter() - start, **labels)
+
+class _NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NO_SPAN = _NoSpan()
+
+def span(name, **labels):
+    """Context manager timing a block of code as span `name`."""
+    if not ENABLED:
+        return _NO_SPAN
+    return _span(name, labels)
+
+def timed(name=None):
+    """Decorator timing each call of a function as a span (named after the function by default)."""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            with _span(span_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def metrics_snapshot():
+    """Return a copy of the recorded metrics keyed by (span name, labels)."""
+    with _metrics_lock:
+        return {key: dict(metric, buckets=list(metric["buckets"])) for key, metric in _metrics.items()}
+
+def reset_metrics():
+    """Forget all recorded metrics."""
+    with _metrics_lock:
+        _metrics.clear()
+
+def _label_text(labels, **extra):
+    items = list(labels) + list(extra.items())
+    return "{" + ",".join(f'{k}="{str(v)}"' for k, v in items) + "}"
+
+def render_metrics():
+    """Return the recorded metrics in the Prometheus text exposition format."""
+    lines = [
+        "# HELP as3610_span_seconds Duration of instrumented spans.",
+        "# TYPE as3610_span_seconds histogram"
+    ]
+    snapshot = sorted(metrics_snapshot().items())
+    for (name, labels), metric in snapshot:
+        cumulative = 0
+        for bound, count in zip(DURATION_BUCKETS, metric["buckets"]):
+            cumulative += count
+            lines.append(f"as3610_span_seconds_bucket{_label_text(labels, span=name, le=bound)} {cumulative}")
+        lines.append(f"as3610_span_seconds_bucket{_label_text(labels, span=name, le='+Inf')} {metric['count']}")
+        lines.append(f"as3610_span_seconds_sum{_label_text(labels, span=name)} {metric['sum']:.6f}")
+        lines.append(f"as3610_span_seconds_count{_label_text(labels, span=name)} {metric['count']}")
+    lines += [
+        "# HELP as3610_span_errors_total Instrumented spans that raised an exception.",
+        "# TYPE as3610_span_errors_total counter"
+    ]
+    for (name, labels), metric in snapshot:
+        lines.append(f"as3610_span_errors_total{_label_text(labels, span=name)} {metric['errors']}")
+    return "\n".join(lines) + "\n"
+
+def write_metrics(path=None):
+    """Write the metrics to `path` (default METRICS_PATH), replacing the file atomically."""
+    path = path or METRICS_PATH
+    if not path:
+        return
+    # Each writer uses its own temporary file, as concurrent reruns of the app
+    # are threads of one process
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(render_metrics())
+        # mkstemp creates the file readable by its owner only
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+if TRACE_LOG:
+    enable(TRACE_LOG)
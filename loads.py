@@ -0,0 +1,119 @@
+"""Calculation core of the AS 3610.2 (Int):2023 load combination calculator.
+
+Only uses the standard library, so it can be imported by scripts and tests
+without loading the app, plotting or report dependencies.
+"""
+from instrumentation import timed
+
+# Program details
+PROGRAM_VERSION = "1.0 - 2025"
+PROGRAM = "Load Combination Calculator to AS 3610.2 (Int):2023"
+
+# Default values of the input parameters
+DEFAULT_INPUTS = {
+    'G_f': 0.6,
+    'thickness': 0.2,
+    'reinforcement_percentage': 2.0,
+    'Q_w1': 1.0,
+    'Q_w2': 2.0,
+    'Q_w3': 1.0,
+    'Q_m': 2.5,
+    'Q_h': 0.0,
+    'W_s': 0.0,
+    'W_u': 0.0,
+    'F_w': 0.0,
+    'Q_x': 0.0,
+    'P_c': 0.0,
+    'I': 0.0
+}
+
+STAGE_DESCRIPTIONS = {
+    "1": "Prior to concrete placement",
+    "2": "During concrete placement",
+    "3": "After concrete placement"
+}
+
+@timed()
+def calculate_concrete_load(thickness, reinforcement_percentage):
+    """Calculate G_c in kN/m² based on concrete thickness and reinforcement percentage."""
+    base_density = 24  # kN/m³
+    reinforcement_load = 0.5 * reinforcement_percentage  # kN/m²
+    G_c = base_density * thickness + reinforcement_load * thickness
+    return G_c
+
+# Rules of AS 3610.2 Table 3.3.1, one per combination: number, stage, vertical
+# factors, horizontal factors and whether the combination is scaled by γ_d.
+# Q_w is the workers and equipment load of the combination's stage. The
+# evaluators, factor matrices and descriptions are all generated from this table.
+COMBINATION_RULES = (
+    (1, "1", {'G_f': 1.35}, {}, False),
+    (2, "1", {'G_f': 1.2, 'Q_w': 1.5, 'Q_m': 1.5, 'W_s': 1.0}, {'Q_h': 1.5}, True),
+    (3, "1", {'G_f': 1.2, 'W_u': 1.0, 'F_w': 1.5}, {}, False),
+    (4, "1", {'G_f': 0.9, 'W_u': 1.0, 'F_w': 1.5}, {}, False),
+    (5, "1", {'G_f': 1.0, 'I': 1.1}, {}, False),
+    (6, "2", {'G_f': 1.35, 'G_c': 1.35}, {}, True),
+    (7, "2", {'G_f': 1.2, 'G_c': 1.2, 'Q_w': 1.5, 'Q_m': 1.5, 'W_s': 1.0, 'F_w': 1.5, 'Q_x': 1.5, 'P_c': 1.0}, {'Q_h': 1.5}, True),
+    (8, "2", {'G_f': 1.0, 'G_c': 1.0, 'I': 1.1}, {}, False),
+    (9, "3", {'G_f': 1.35, 'G_c': 1.35}, {}, True),
+    (10, "3", {'G_f': 1.2, 'G_c': 1.2, 'Q_w': 1.5, 'Q_m': 1.5, 'W_s': 1.0, 'F_w': 1.5, 'Q_x': 1.5, 'P_c': 1.0}, {'Q_h': 1.5}, True),
+    (11, "3", {'G_f': 1.2, 'G_c': 1.2, 'W_u': 1.0}, {}, False),
+    (12, "3", {'G_f': 1.0, 'G_c': 1.0, 'I': 1.1}, {}, False)
+)
+
+# Actions in the order their terms are written in combination descriptions
+ACTIONS = ('G_f', 'G_c', 'Q_w', 'Q_m', 'Q_h', 'W_s', 'W_u', 'F_w', 'Q_x', 'P_c', 'I')
+
+def _action_symbol(action, html):
+    symbol, _, subscript = action.partition('_')
+    if subscript:
+        return f"{symbol}<sub>{subscript}</sub>" if html else symbol + subscript
+    return symbol
+
+def combination_description(rule, html=True):
+    """Return the description of a combination rule, e.g. "6: 1.35G<sub>f</sub> + 1.35G<sub>c</sub>"."""
+    number, _, vertical, horizontal, _ = rule
+    factors = {**vertical, **horizontal}
+    terms = [f"{factors[action]:g}{_action_symbol(action, html)}" for action in ACTIONS if action in factors]
+    return f"{number}: " + " + ".join(terms)
+
+def compile_stage_rules(rules):
+    """Group combination rules by stage as (vertical terms, horizontal terms, γ_d applies) tuples."""
+    stages = {}
+    for _, stage, vertical, horizontal, gamma_d_applies in rules:
+        stages.setdefault(stage, []).append((tuple(vertical.items()), tuple(horizontal.items()), gamma_d_applies))
+    return stages
+
+_STAGE_RULES = compile_stage_rules(COMBINATION_RULES)
+
+@timed()
+def compute_combinations(G_f, G_c, Q_w, Q_m, Q_h, W_s, W_u, F_w, Q_x, P_c, I, stage, gamma_d):
+    """Compute load combinations for a given stage and gamma_d."""
+    values = {'G_f': G_f, 'G_c': G_c, 'Q_w': Q_w, 'Q_m': Q_m, 'Q_h': Q_h, 'W_s': W_s,
+              'W_u': W_u, 'F_w': F_w, 'Q_x': Q_x, 'P_c': P_c, 'I': I}
+    combinations = []
+    for vertical, horizontal, gamma_d_applies in _STAGE_RULES.get(stage, ()):
+        scale = gamma_d if gamma_d_applies else 1.0
+        combinations.append((
+            scale * sum(factor * values[action] for action, factor in vertical),
+            scale * sum(factor * values[action] for action, factor in horizontal)
+        ))
+    return combinations
+
+# Stage of each of the 12 combinations in AS 3610.2 Table 3.3.1
+COMBINATION_STAGES = tuple(rule[1] for rule in COMBINATION_RULES)
+
+# γ_d values of critical and non-critical members
+GAMMA_D_VALUES = (1.3, 1.0)
+
+# Description of each of the 12 combinations, with HTML subscripts
+COMBINATION_DESCRIPTIONS = tuple(combination_description(rule) for rule in COMBINATION_RULES)
+
+# The same descriptions as plain text
+COMBINATION_DESCRIPTIONS_PLAIN = tuple(combination_description(rule, html=False) for rule in COMBINATION_RULES)
+
+def get_combination_description(stage, index):
+    """Get the description text for each combination with proper formatting."""
+    offset = COMBINATION_STAGES.index(stage)
+    if index < COMBINATION_STAGES.count(stage):
+        return COMBINATION_DESCRIPTIONS[offset + index]
+    return f"Combination {index+1}"
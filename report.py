@@ -0,0 +1,374 @@
+"""PDF report of the load combination results, built with ReportLab."""
+import functools
+import io
+import threading
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib import colors
+from reportlab.lib.units import mm
+from reportlab.platypus import SimpleDocTemplate, PageBreak, Paragraph, Spacer, Table, TableStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.enums import TA_LEFT, TA_CENTER
+
+from assets import get_logo
+from cache import get_cache, report_cache_key
+from instrumentation import span, timed
+from loads import COMBINATION_DESCRIPTIONS, PROGRAM, PROGRAM_VERSION, STAGE_DESCRIPTIONS
+
+# Company details
+COMPANY_NAME = "tekhne Consulting Engineers"
+COMPANY_ADDRESS = ""
+
+@functools.lru_cache(maxsize=None)
+def get_report_styles():
+    """Return the paragraph styles of the PDF report, built once per process."""
+    styles = getSampleStyleSheet()
+    
+    # Custom styles (adjusted for single-page fit)
+    title_style = ParagraphStyle(
+        name='Title',
+        parent=styles['Title'],
+        fontSize=14,  # Reduced from 16
+        leading=18,
+        alignment=TA_CENTER,
+        spaceAfter=8  # Reduced from 12
+    )
+    
+    subtitle_style = ParagraphStyle(
+        name='Subtitle',
+        parent=styles['Normal'],
+        fontSize=10,
+        alignment=TA_CENTER,
+        spaceAfter=15
+    )
+    
+    heading1_style = ParagraphStyle(
+        name='Heading1',
+        parent=styles['Heading1'],
+        fontSize=14,
+        spaceBefore=20,
+        spaceAfter=10
+    )
+    
+    heading2_style = ParagraphStyle(
+        name='Heading2',
+        parent=styles['Heading2'],
+        fontSize=12,
+        spaceBefore=15,
+        spaceAfter=8
+    )
+    
+    heading3_style = ParagraphStyle(
+        name='Heading3',
+        parent=styles['Heading3'],
+        fontSize=11,  # Reduced from 12
+        spaceAfter=4  # Reduced from 6
+    )
+    
+    normal_style = ParagraphStyle(
+        name='Normal',
+        parent=styles['Normal'],
+        fontSize=10,
+        leading=12,
+        spaceAfter=8
+    )
+    
+    table_header_style = ParagraphStyle(
+        name='TableHeader',
+        parent=styles['Normal'],
+        fontSize=10,
+        leading=12,
+        fontName='Helvetica-Bold',
+        alignment=TA_CENTER
+    )
+    
+    table_cell_style = ParagraphStyle(
+        name='TableCell',
+        parent=styles['Normal'],
+        fontSize=8,  # Reduced from 9
+        leading=9,   # Reduced from 11
+        alignment=TA_LEFT
+    )
+    
+    table_cell_center_style = ParagraphStyle(
+        name='TableCellCenter',
+        parent=styles['Normal'],
+        fontSize=8,  # Reduced from 9
+        leading=9,   # Reduced from 11
+        alignment=TA_CENTER
+    )
+    
+    return {
+        'title': title_style,
+        'subtitle': subtitle_style,
+        'heading1': heading1_style,
+        'heading2': heading2_style,
+        'heading3': heading3_style,
+        'normal': normal_style,
+        'table_header': table_header_style,
+        'table_cell': table_cell_style,
+        'table_cell_center': table_cell_center_style
+    }
+
+# Rows of the input parameter table: input key, label and value format
+INPUT_PARAMETERS = [
+    ('G_f', "Formwork self-weight (G<sub>f</sub>)", "{:.2f} kN/m²"),
+    ('thickness', "Concrete thickness", "{:.2f} m"),
+    ('reinforcement_percentage', "Reinforcement percentage", "{:.1f}%"),
+    ('G_c', "Concrete load (G<sub>c</sub>)", "{:.2f} kN/m²"),
+    ('Q_w1', "Workers & equipment - Stage 1 (Q<sub>w1</sub>)", "{:.2f} kN/m²"),
+    ('Q_w2', "Workers & equipment - Stage 2 (Q<sub>w2</sub>)", "{:.2f} kN/m²"),
+    ('Q_w3', "Workers & equipment - Stage 3 (Q<sub>w3</sub>)", "{:.2f} kN/m²"),
+    ('Q_m', "Stacked materials (Q<sub>m</sub>)", "{:.2f} kN/m²"),
+    ('Q_h', "Horizontal imposed load (Q<sub>h</sub>)", "{:.2f} kN/m"),
+    ('W_s', "Service wind load (W<sub>s</sub>)", "{:.2f} kN/m²"),
+    ('W_u', "Ultimate wind load (W<sub>u</sub>)", "{:.2f} kN/m²"),
+    ('F_w', "Flowing water load (F_w)", "{:.2f} kN/m²"),
+    ('Q_x', "Other actions (Q<sub>x</sub>)", "{:.2f} kN/m²"),
+    ('P_c', "Lateral concrete pressure (P<sub>c</sub>)", "{:.2f} kN/m²"),
+    ('I', "Impact load (I)", "{:.2f} kN/m²")
+]
+
+class _StaticParagraph(Paragraph):
+    """Table cell paragraph whose line breaking is kept between reports.
+
+    Static cells are always wrapped at the same column width, so the result of
+    the first wrap is reused instead of breaking the lines again.
+    """
+
+    def wrap(self, availWidth, availHeight):
+        if getattr(self, '_wrapped_width', None) != availWidth:
+            self._wrapped_size = Paragraph.wrap(self, availWidth, availHeight)
+            self._wrapped_width = availWidth
+        return self._wrapped_size
+
+class ReportTemplate:
+    """Styles, table layouts and static content of the PDF report.
+
+    Built once per process (see get_report_template) so that each report only
+    creates the cells that depend on its inputs and results. Static flowables
+    are shared between reports, so builds are serialized with a lock.
+    """
+
+    input_col_widths = [60*mm, 30*mm, 10*mm, 60*mm, 30*mm]
+    results_col_widths = [100*mm, 40*mm, 50*mm]
+
+    def __init__(self):
+        self.styles = get_report_styles()
+        self._lock = threading.Lock()
+
+        common_table_style = [
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
+            ('LEFTPADDING', (0, 0), (-1, -1), 3),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 3),
+            # Value cells are plain strings drawn in the table cell font
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('LEADING', (0, 1), (-1, -1), 9),
+        ]
+        self.input_table_style = TableStyle(common_table_style + [
+            ('ALIGN', (1, 0), (1, -1), 'CENTER'),
+            ('ALIGN', (4, 0), (4, -1), 'CENTER'),
+        ])
+        self.results_table_style = TableStyle(common_table_style + [
+            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+        ])
+
+        styles = self.styles
+        self.title = Paragraph("Load Combination Report for Falsework Design", styles['title'])
+        self.subtitle = Paragraph("to AS 3610.2 (Int):2023 - Strength Limit State", styles['subtitle'])
+        self.input_heading = Paragraph("Input Parameters", styles['heading1'])
+        self.results_heading = Paragraph("Load Combination Results", styles['heading1'])
+        self.results_subtitle = Paragraph("Strength Limit State - AS 3610.2 (Int):2023 Table 3.3.1", styles['subtitle'])
+        self.critical_heading = Paragraph("Critical Members (γ<sub>d</sub> = 1.3)", styles['heading3'])
+        self.non_critical_heading = Paragraph("Non-Critical Members (γ<sub>d</sub> = 1.0)", styles['heading3'])
+        self.stage_headings = {
+            stage: Paragraph(f"Stage {stage}: {description}", styles['heading2'])
+            for stage, description in STAGE_DESCRIPTIONS.items()
+        }
+        self.input_labels = [_StaticParagraph(label, styles['table_cell']) for _, label, _ in INPUT_PARAMETERS]
+        self.results_header = [
+            _StaticParagraph("Combination", styles['table_header']),
+            _StaticParagraph("Vertical Load<br/>(kN/m²)", styles['table_header']),
+            _StaticParagraph("Horizontal Load<br/>(kN/m or kN/m²)", styles['table_header'])
+        ]
+        self.combination_labels = [_StaticParagraph(d, styles['table_cell']) for d in COMBINATION_DESCRIPTIONS]
+
+    def _input_table(self, inputs):
+        rows = [["Parameter", "Value", "", "Parameter", "Value"]]
+        cells = [
+            (label, fmt.format(inputs[key]))
+            for label, (key, _, fmt) in zip(self.input_labels, INPUT_PARAMETERS)
+        ]
+        for i in range(0, len(cells), 2):
+            row = [cells[i][0], cells[i][1], ""]
+            row += [cells[i+1][0], cells[i+1][1]] if i+1 < len(cells) else ["", ""]
+            rows.append(row)
+        table = Table(rows, colWidths=self.input_col_widths)
+        table.setStyle(self.input_table_style)
+        return table
+
+    def _results_table(self, rows):
+        table_rows = [self.results_header]
+        for combination, vertical, horizontal in zip(rows["combination"], rows["vertical"], rows["horizontal"]):
+            table_rows.append([self.combination_labels[combination - 1], f"{vertical:.2f}", f"{horizontal:.2f}"])
+        table = Table(table_rows, colWidths=self.results_col_widths)
+        table.setStyle(self.results_table_style)
+        return table
+
+    def title_elements(self, project_number, project_name):
+        """Return the title and project details at the top of a report."""
+        project_info = (
+            f"<b>Project:</b> {escape(str(project_name))}<br/>"
+            f"<b>Number:</b> {escape(str(project_number))}<br/>"
+            f"<b>Date:</b> {datetime.now().strftime('%d %B %Y')}"
+        )
+        return [self.title, self.subtitle, Paragraph(project_info, self.styles['normal']), Spacer(1, 8*mm)]
+
+    def results_elements(self, inputs, results):
+        """Return the input table and results tables of one case."""
+        elements = []
+        
+        # Input Parameters section
+        elements.append(self.input_heading)
+        elements.append(self._input_table(inputs))
+        
+        # Results section
+        elements.append(self.results_heading)
+        elements.append(self.results_subtitle)
+        elements.append(Spacer(1, 6*mm))
+        
+        for stage, stage_rows in results.groupby("stage", sort=True):
+            elements.append(self.stage_headings[str(stage)])
+            elements.append(Spacer(1, 3*mm))
+            
+            elements.append(self.critical_heading)
+            elements.append(self._results_table(stage_rows[stage_rows["gamma_d"] == 1.3]))
+            elements.append(Spacer(1, 6*mm))
+            
+            elements.append(self.non_critical_heading)
+            elements.append(self._results_table(stage_rows[stage_rows["gamma_d"] == 1.0]))
+        return elements
+
+    def elements(self, inputs, results, project_number, project_name):
+        """Return the flowables of one report for a results table (see build_results_table)."""
+        return self.title_elements(project_number, project_name) + self.results_elements(inputs, results)
+
+    def draw_header_footer(self, canvas, doc):
+        """Draw the company header and program footer on a page."""
+        canvas.saveState()
+        
+        # Draw Header
+        logo = get_logo()
+        if logo:
+            try:
+                canvas.drawImage(logo, 15*mm, A4[1] - 25*mm, width=40*mm, height=15*mm, mask='auto')  # Position logo at top-left
+            except:
+                pass
+        
+        canvas.setFont('Helvetica-Bold', 10)
+        canvas.drawString(60*mm, A4[1] - 15*mm, COMPANY_NAME)
+        canvas.setFont('Helvetica', 8)
+        canvas.drawString(60*mm, A4[1] - 20*mm, COMPANY_ADDRESS)
+        
+        # Draw Footer
+        canvas.setFont('Helvetica', 8)
+        footer_text = f"{PROGRAM} {PROGRAM_VERSION} | {COMPANY_NAME} © | Page {doc.page}"
+        canvas.drawCentredString(A4[0]/2.0, 10*mm, footer_text)
+        
+        canvas.restoreState()
+
+    def _doc(self, output):
+        return SimpleDocTemplate(output, pagesize=A4,
+                                 leftMargin=15*mm, rightMargin=15*mm,
+                                 topMargin=20*mm, bottomMargin=15*mm)
+
+    def build(self, inputs, results, project_number, project_name, output=None):
+        """Build the report into `output` (a new BytesIO by default) and return it."""
+        output = output if output is not None else io.BytesIO()
+        doc = self._doc(output)
+        with self._lock, span("doc_build"):
+            doc.build(self.elements(inputs, results, project_number, project_name),
+                      onFirstPage=self.draw_header_footer, onLaterPages=self.draw_header_footer)
+        if hasattr(output, 'seek'):
+            output.seek(0)
+        return output
+
+    def build_consolidated(self, bays, project_number, project_name, output):
+        """Build one report covering many bays into `output` (a file name or binary file).
+
+        `bays` is an iterable of (name, inputs, results) tuples and may be a
+        generator; each bay is only requested when the previous one has been
+        laid out, so only one bay's results and flowables are in memory at a
+        time. ReportLab still keeps the drawn content of each page (about
+        10 KB) until the document is saved. Each bay after the first starts
+        on a new page.
+        """
+        def bay_elements():
+            for i, (name, inputs, results) in enumerate(bays):
+                elements = [PageBreak()] if i else []
+                elements.append(Paragraph(f"Bay: {escape(str(name))}", self.styles['heading1']))
+                yield elements + self.results_elements(inputs, results)
+
+        flowables = _LazyFlowables(bay_elements())
+        flowables.extend(self.title_elements(project_number, project_name))
+        with self._lock, span("doc_build", report="consolidated"):
+            self._doc(output).build(flowables, onFirstPage=self.draw_header_footer,
+                                    onLaterPages=self.draw_header_footer)
+        return output
+
+class _LazyFlowables(list):
+    """Flowables list for doc.build that is refilled from an iterator of flowable lists.
+
+    doc.build takes flowables off the front of the list until len() is zero,
+    so the next list is only created when the previous one has been consumed.
+    """
+
+    def __init__(self, chunks):
+        super().__init__()
+        self._chunks = iter(chunks)
+
+    def __len__(self):
+        if not list.__len__(self):
+            for chunk in self._chunks:
+                self.extend(chunk)
+                if list.__len__(self):
+                    break
+        return list.__len__(self)
+
+@functools.lru_cache(maxsize=None)
+def get_report_template():
+    """Return the process-wide ReportTemplate."""
+    return ReportTemplate()
+
+@timed()
+def generate_pdf_report(inputs, results, project_number, project_name):
+    """Generate a professional PDF report with company branding and header on all pages."""
+    return get_report_template().build(inputs, results, project_number, project_name)
+
+def get_pdf_report(inputs, results, project_number, project_name):
+    """Return the PDF report bytes, reusing a cached report when available."""
+    cache = get_cache()
+    key = report_cache_key(inputs, project_number, project_name)
+    pdf = cache.get(key)
+    if pdf is None:
+        pdf = generate_pdf_report(inputs, results, project_number, project_name).getvalue()
+        cache.put(key, pdf)
+    return pdf
+
+def write_consolidated_report(bays, project_number, project_name, output):
+    """Write one PDF report covering many bays to `output` (a file name or binary file).
+
+    `bays` is an iterable of (name, inputs, results) tuples; see
+    ReportTemplate.build_consolidated.
+    """
+    return get_report_template().build_consolidated(bays, project_number, project_name, output)
@@ -0,0 +1,264 @@
+"""HTTP JSON service for the AS 3610.2 load combinations.
+
+    python service.py --port 8610 --report-workers 2
+
+Endpoints (all POST, JSON body):
+
+- /combinations: {"cases": [inputs, ...]} -> loads of all 12 combinations
+  for each case and γ_d value
+- /envelope: {"cases": [inputs, ...]} -> governing vertical and horizontal
+  combination of each case
+- /report: {"inputs": {...}, "project_number": "...", "project_name": "..."}
+  -> PDF report (application/pdf)
+- GET /metrics: span counters and duration histograms in the Prometheus text
+  format (see instrumentation.py; empty unless AS3610_INSTRUMENT is set)
+
+Inputs use the names of DEFAULT_INPUTS; missing values take their defaults.
+Concurrent calculation requests are collected into micro-batches and
+evaluated together with compute_envelope, while PDF reports are rendered in a
+separate pool of worker processes so they never hold up calculations.
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from batch import init_report_worker, parse_case
+from engine import compute_envelope, get_results_table
+from instrumentation import render_metrics, span
+from loads import COMBINATION_STAGES, DEFAULT_INPUTS, GAMMA_D_VALUES
+
+# Longest time a request waits for others to join its batch, in seconds
+BATCH_WINDOW = 0.002
+
+# Largest number of cases evaluated in one batch
+MAX_BATCH_CASES = 50000
+
+# Longest time a request waits for its PDF report, in seconds
+REPORT_TIMEOUT = 60
+
+class MicroBatcher:
+    """Collects the cases of concurrent requests and evaluates them together.
+
+    submit() returns a Future resolving to the compute_envelope result of the
+    submitted cases only. A background thread takes the first waiting request,
+    keeps collecting requests for up to `window` seconds or `max_cases` cases,
+    and evaluates them all with a single compute_envelope call.
+    """
+
+    def __init__(self, window=BATCH_WINDOW, max_cases=MAX_BATCH_CASES):
+        self.window = window
+        self.max_cases = max_cases
+        self.batches = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, cases):
+        """Queue a list of inputs dicts for evaluation and return a Future."""
+        future = Future()
+        self._queue.put((cases, future))
+        return future
+
+    def _collect(self):
+        pending = [self._queue.get()]
+        n_cases = len(pending[0][0])
+        deadline = time.monotonic() + self.window
+        while n_cases < self.max_cases:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            pending.append(item)
+            n_cases += len(item[0])
+        return pending
+
+    def _run(self):
+        while True:
+            pending = self._collect()
+            cases = [case for item, _ in pending for case in item]
+            try:
+                with span("micro_batch"):
+                    columns = {name: [case[name] for case in cases] for name in DEFAULT_INPUTS}
+                    envelope = compute_envelope(columns)
+            except Exception as exc:
+                for _, future in pending:
+                    future.set_exception(exc)
+                continue
+            self.batches += 1
+            start = 0
+            for item, future in pending:
+                end = start + len(item)
+                future.set_result(_slice_envelope(envelope, start, end))
+                start = end
+
+def _slice_envelope(envelope, start, end):
+    """Return the part of a compute_envelope result for cases start:end."""
+    return {
+        key: ({k: v[start:end] for k, v in value.items()} if isinstance(value, dict) else value[start:end])
+        for key, value in envelope.items()
+    }
+
+def combinations_response(envelope):
+    loads = np.round(envelope["loads"], 6)
+    return {
+        "gamma_d": list(GAMMA_D_VALUES),
+        "stages": list(COMBINATION_STAGES),
+        "results": [
+            {"vertical": case[..., 0].tolist(), "horizontal": case[..., 1].tolist()}
+            for case in loads
+        ]
+    }
+
+def envelope_response(envelope):
+    results = []
+    for i in range(len(envelope["loads"])):
+        results.append({
+            direction: {
+                "value": round(float(envelope[direction]["value"][i]), 6),
+                "stage": str(envelope[direction]["stage"][i]),
+                "combination": int(envelope[direction]["combination"][i]),
+                "gamma_d": float(envelope[direction]["gamma_d"][i])
+            }
+            for direction in ("vertical", "horizontal")
+        })
+    return {"results": results}
+
+def render_report(inputs, project_number, project_name):
+    """Render the PDF report of one case and return its bytes (runs in a worker process)."""
+    from report import get_pdf_report
+    return get_pdf_report(inputs, get_results_table(inputs), project_number, project_name)
+
+def parse_request_case(row, index):
+    """Parse one case of a request body, raising ValueError unless it is an object of finite numbers."""
+    if not isinstance(row, dict):
+        raise ValueError(f"case {index + 1}: inputs must be a JSON object")
+    case = parse_case(row, index)
+    for name, value in case["inputs"].items():
+        if not math.isfinite(value):
+            raise ValueError(f"case {index + 1}: '{name}' must be a finite number")
+    return case
+
+class CalculationService:
+    """Shared state of the HTTP service: the micro-batcher and the report pool."""
+
+    def __init__(self, report_workers=2, batch_window=BATCH_WINDOW):
+        self.batcher = MicroBatcher(window=batch_window)
+        # The server and batcher threads are already running, so report workers
+        # are started from a clean forkserver process (spawn where there is none)
+        # rather than forked from this one
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self.reports = ProcessPoolExecutor(
+            max_workers=report_workers, initializer=init_report_worker,
+            mp_context=multiprocessing.get_context(method)
+        )
+
+    def evaluate(self, body):
+        rows = body.get("cases")
+        if not isinstance(rows, list) or not rows:
+            raise ValueError("'cases' must be a non-empty list of input objects")
+        cases = [parse_request_case(row, i)["inputs"] for i, row in enumerate(rows)]
+        return self.batcher.submit(cases).result()
+
+    def report(self, body):
+        case = parse_request_case(body.get("inputs") or {}, 0)
+        future = self.reports.submit(
+            render_report, case["inputs"],
+            str(body.get("project_number", "")), str(body.get("project_name", ""))
+        )
+        return future.result(timeout=REPORT_TIMEOUT)
+
+    def close(self):
+        self.reports.shutdown(cancel_futures=True)
+
+def make_handler(service):
+    """Return a request handler class bound to `service`."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if self.path == "/metrics":
+                self._send(200, "text/plain; version=0.0.4", render_metrics().encode())
+            else:
+                self._send_json(404, {"error": f"unknown endpoint {self.path}"})
+
+        def do_POST(self):
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(body, dict):
+                    raise ValueError("request body must be a JSON object")
+                if self.path == "/combinations":
+                    with span("request", endpoint="/combinations"):
+                        self._send_json(200, combinations_response(service.evaluate(body)))
+                elif self.path == "/envelope":
+                    with span("request", endpoint="/envelope"):
+                        self._send_json(200, envelope_response(service.evaluate(body)))
+                elif self.path == "/report":
+                    with span("request", endpoint="/report"):
+                        self._send(200, "application/pdf", service.report(body))
+                else:
+                    self._send_json(404, {"error": f"unknown endpoint {self.path}"})
+            except (ValueError, KeyError, TypeError) as exc:
+                self._send_json(400, {"error": str(exc)})
+            except Exception as exc:
+                self._send_json(500, {"error": str(exc)})
+
+        def _send_json(self, status, payload):
+            self._send(status, "application/json", json.dumps(payload).encode())
+
+        def _send(self, status, content_type, data):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections under bursts of small requests
+    request_queue_size = 128
+
+def make_server(host="127.0.0.1", port=8610, report_workers=2, batch_window=BATCH_WINDOW):
+    """Create the HTTP server; call serve_forever() on it to start serving."""
+    service = CalculationService(report_workers, batch_window)
+    server = _Server((host, port), make_handler(service))
+    server.service = service
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP service for AS 3610.2 (Int):2023 load combinations")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8610)
+    parser.add_argument("--report-workers", type=int, default=2, help="processes used to render PDF reports")
+    parser.add_argument("--batch-window", type=float, default=BATCH_WINDOW * 1000, help="micro-batch window in ms")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.report_workers, args.batch_window / 1000)
+    print(f"Serving on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Process-wide registry of app sessions and their memory use, for sizing deployments."""
+import os
+import sys
+import threading
+import time
+
+# Sessions not seen for this many seconds no longer count as active
+SESSION_IDLE_TIMEOUT = float(os.environ.get("AS3610_SESSION_IDLE", 30 * 60))
+
+def state_size(value):
+    """Estimate the memory held by a session state value in bytes."""
+    if hasattr(value, "memory_usage") and hasattr(value, "columns"):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(state_size(k) + state_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(state_size(v) for v in value)
+    if hasattr(value, "__dict__") and not isinstance(value, type):
+        return sys.getsizeof(value) + state_size(vars(value))
+    return sys.getsizeof(value)
+
+def process_rss():
+    """Return the resident memory of this process in bytes, or None if unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # ru_maxrss is the peak, in kilobytes on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        return None
+
+class SessionRegistry:
+    """Last-seen time and state size of each session of this process."""
+
+    def __init__(self, idle_timeout=SESSION_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def record(self, session_id, state):
+        """Record a rerun of `session_id` with its session state mapping; return the state size."""
+        size = sum(state_size(value) for value in state.values())
+        with self._lock:
+            self._sessions[session_id] = (time.monotonic(), size)
+        return size
+
+    def stats(self):
+        """Return the number of active sessions and their total and largest state sizes."""
+        now = time.monotonic()
+        with self._lock:
+            for session_id, (seen, _) in list(self._sessions.items()):
+                if now - seen > self.idle_timeout:
+                    del self._sessions[session_id]
+            sizes = [size for _, size in self._sessions.values()]
+        return {
+            "active_sessions": len(sizes),
+            "session_state_bytes": sum(sizes),
+            "largest_session_bytes": max(sizes, default=0),
+            "process_rss_bytes": process_rss()
+        }
@@ -0,0 +1,55 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+import assets
+from stub_server import make_logo_png, serve_logo
+
+@pytest.fixture
+def logo_settings(monkeypatch, tmp_path):
+    monkeypatch.setattr(assets, "LOGO_PATH", "")
+    monkeypatch.setattr(assets, "LOGO_OFFLINE", False)
+    monkeypatch.setattr(assets, "LOGO_TIMEOUT", 1.0)
+    monkeypatch.setattr(assets, "LOGO_LOCAL_COPY", str(tmp_path / "static" / "logo.png"))
+    assets.clear_logo_cache()
+    yield
+    wait_for_refresh()
+    assets.clear_logo_cache()
+
+def wait_for_refresh():
+    while assets._logo_cache["refreshing"]:
+        time.sleep(0.01)
+
+def test_download_is_saved_as_local_copy(logo_settings, monkeypatch):
+    body = make_logo_png(width=200)
+    with serve_logo(body=body) as url:
+        monkeypatch.setattr(assets, "LOGO_URL", url)
+        monkeypatch.setattr(assets, "FALLBACK_LOGO_URL", url)
+        assert assets.get_logo() is not None
+    with open(assets.LOGO_LOCAL_COPY, "rb") as f:
+        assert f.read() == body
+
+def test_local_copy_is_served_without_waiting(logo_settings, monkeypatch):
+    local = make_logo_png(width=100)
+    os.makedirs(os.path.dirname(assets.LOGO_LOCAL_COPY))
+    with open(assets.LOGO_LOCAL_COPY, "wb") as f:
+        f.write(local)
+    body = make_logo_png(width=200)
+    with serve_logo(body=body, delay=0.5) as url:
+        monkeypatch.setattr(assets, "LOGO_URL", url)
+        monkeypatch.setattr(assets, "FALLBACK_LOGO_URL", url)
+        start = time.perf_counter()
+        assert assets.get_logo() is not None
+        assert time.perf_counter() - start < 0.25
+        assert assets._logo_cache["data"] == local
+        wait_for_refresh()
+    assert assets._logo_cache["data"] == body
+    assert assets._logo_cache["url"] == url
+
+def test_no_logo_when_offline_without_local_copy(logo_settings, monkeypatch):
+    monkeypatch.setattr(assets, "LOGO_OFFLINE", True)
+    assert assets.get_logo() is None
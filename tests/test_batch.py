@@ -0,0 +1,104 @@
+import csv
+import json
+import os
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("AS3610_LOGO_OFFLINE", "1")
+
+from batch import evaluate_chunk, evaluate_chunk_columns, main, parse_case, read_cases, run_batch
+from engine import compute_combinations_batch
+from loads import COMBINATION_STAGES, DEFAULT_INPUTS, GAMMA_D_VALUES, calculate_concrete_load
+
+def write_csv(path, rows):
+    path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+    return str(path)
+
+def test_read_cases_formats(tmp_path):
+    rows = [{"case": "A", "thickness": 0.2}, {"case": "B", "thickness": 0.3}]
+    (tmp_path / "cases.json").write_text(json.dumps(rows), encoding="utf-8")
+    (tmp_path / "cases.jsonl").write_text("\n".join(json.dumps(r) for r in rows) + "\n\n", encoding="utf-8")
+    write_csv(tmp_path / "cases.csv", ["case,thickness", "A,0.2", "B,0.3"])
+    assert list(read_cases(str(tmp_path / "cases.json"))) == rows
+    assert list(read_cases(str(tmp_path / "cases.jsonl"))) == rows
+    assert list(read_cases(str(tmp_path / "cases.csv"))) == [
+        {"case": "A", "thickness": "0.2"}, {"case": "B", "thickness": "0.3"}
+    ]
+    (tmp_path / "cases.txt").write_text("", encoding="utf-8")
+    with pytest.raises(ValueError, match="Unsupported input file type"):
+        list(read_cases(str(tmp_path / "cases.txt")))
+
+def test_parse_case_defaults():
+    case = parse_case({"thickness": "0.25", "Q_m": "", "project_number": "P1"}, 4)
+    assert case["case"] == "5"
+    assert case["index"] == 4
+    assert case["project_number"] == "P1"
+    assert case["inputs"]["thickness"] == 0.25
+    assert case["inputs"]["Q_m"] == DEFAULT_INPUTS["Q_m"]
+    assert case["inputs"]["G_c"] == calculate_concrete_load(0.25, DEFAULT_INPUTS["reinforcement_percentage"])
+
+@pytest.mark.parametrize("value", ["bad", [1]])
+def test_parse_case_names_bad_field(value):
+    with pytest.raises(ValueError, match=r"row 3 \(case Bay 7\): 'thickness' must be a number"):
+        parse_case({"case": "Bay 7", "thickness": value}, 2)
+
+def test_run_batch_matches_engine(tmp_path):
+    rows = ["case,thickness,Q_m"] + [f"C{i},{0.1 + 0.05 * i},{i}" for i in range(5)]
+    cases = write_csv(tmp_path / "cases.csv", rows)
+    out = tmp_path / "results.csv"
+    assert run_batch(cases, str(out), chunk_size=2) == 5
+    with open(out, newline="", encoding="utf-8") as f:
+        results = list(csv.DictReader(f))
+    assert len(results) == 5 * len(COMBINATION_STAGES) * len(GAMMA_D_VALUES)
+
+    parsed = [parse_case(row, i) for i, row in enumerate(read_cases(cases))]
+    columns = {name: [case["inputs"][name] for case in parsed] for name in list(DEFAULT_INPUTS) + ["G_c"]}
+    for gamma_d in GAMMA_D_VALUES:
+        expected = compute_combinations_batch(columns, gamma_d)
+        got = [r for r in results if float(r["gamma_d"]) == gamma_d]
+        got.sort(key=lambda r: (int(r["case"][1:]), int(r["combination"])))
+        vertical = np.array([float(r["vertical"]) for r in got]).reshape(5, -1)
+        horizontal = np.array([float(r["horizontal"]) for r in got]).reshape(5, -1)
+        np.testing.assert_allclose(vertical, expected[..., 0], atol=1e-6)
+        np.testing.assert_allclose(horizontal, expected[..., 1], atol=1e-6)
+
+def test_report_names_are_unique(tmp_path):
+    cases = write_csv(tmp_path / "cases.csv", [
+        "case,project_number,thickness",
+        "Bay 1,P1,0.2",
+        "Bay 1,P2,0.3",
+        "B<x>,P1,0.2",
+        "B>x<,P1,0.2"
+    ])
+    reports = tmp_path / "reports"
+    assert run_batch(cases, reports_dir=str(reports)) == 4
+    names = sorted(os.listdir(reports))
+    assert len(names) == 4
+    assert "Load_Combination_Report_1_Bay_1.pdf" in names
+    assert "Load_Combination_Report_2_Bay_1.pdf" in names
+
+def test_consolidated_report(tmp_path):
+    cases = write_csv(tmp_path / "cases.csv", ["case,thickness", "A,0.2", "B,0.3"])
+    path = tmp_path / "site.pdf"
+    assert run_batch(cases, consolidated_path=str(path), project_name="Site") == 2
+    assert path.read_bytes().startswith(b"%PDF")
+
+def test_main_reports_bad_value(tmp_path, capsys):
+    cases = write_csv(tmp_path / "cases.csv", ["case,thickness", "A,0.2", "B,bad"])
+    assert main([cases, "--out", str(tmp_path / "results.csv")]) == 1
+    assert "row 2 (case B): 'thickness' must be a number" in capsys.readouterr().err
+
+def test_row_and_column_output_agree():
+    chunk = [parse_case({"case": "A", "thickness": 0.2}, 0), parse_case({"case": "B", "Q_m": 3}, 1)]
+    rows = list(evaluate_chunk(chunk))
+    columns = evaluate_chunk_columns(chunk)
+    assert len(rows) == len(columns["vertical"])
+    for i, row in enumerate(rows):
+        assert type(row["stage"]) is int
+        assert row["stage"] == columns["stage"][i]
+        assert row["combination"] == columns["combination"][i]
+        assert row["gamma_d"] == columns["gamma_d"][i]
+        assert row["case"] == columns["case"][i]
+        assert row["vertical"] == pytest.approx(columns["vertical"][i], abs=1e-6)
+        assert row["horizontal"] == pytest.approx(columns["horizontal"][i], abs=1e-6)
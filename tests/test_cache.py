@@ -0,0 +1,76 @@
+import time
+
+from cache import ResultCache, cache_key
+
+def test_cache_key_is_canonical():
+    assert cache_key("results", {"a": 1, "b": 2.5}) == cache_key("results", {"b": 2.5, "a": 1.0})
+    assert cache_key("results", {"a": 1}) != cache_key("results", {"a": 2})
+    assert cache_key("results", {"a": 1}) != cache_key("report", {"a": 1})
+    assert cache_key("report", {"a": 1}, project_name="X") != cache_key("report", {"a": 1}, project_name="Y")
+
+def test_memory_tier_is_a_byte_bounded_lru():
+    cache = ResultCache(memory_bytes=30)
+    cache.put("a", b"x" * 10)
+    cache.put("b", b"x" * 10)
+    cache.put("c", b"x" * 10)
+    assert cache.get("a") == b"x" * 10
+    cache.put("d", b"x" * 10)
+    # "b" was least recently used
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None and cache.get("d") is not None
+    # Replacing an entry does not count its old size twice
+    cache.put("d", b"y" * 10)
+    stats = cache.stats()
+    assert stats["memory_entries"] == 3
+    assert stats["memory_size"] == 30
+    assert stats["memory_evictions"] == 1
+    assert stats["disk_evictions"] == 0
+    # Values larger than the whole tier are not kept in memory
+    cache.put("big", b"x" * 31)
+    assert cache.get("big") is None
+
+def test_hit_and_miss_counters():
+    cache = ResultCache()
+    assert cache.get("a") is None
+    cache.put("a", b"1")
+    assert cache.get("a") == b"1"
+    assert cache.get("a") == b"1"
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["disk_hits"], stats["misses"]) == (2, 0, 1)
+
+def test_disk_hits_are_copied_to_memory(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    ResultCache(path=path).put("a", b"data")
+    cache = ResultCache(path=path)
+    assert cache.get("a") == b"data"
+    assert cache.get("a") == b"data"
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["disk_hits"], stats["misses"]) == (1, 1, 0)
+    assert stats["memory_entries"] == 1
+
+def test_instances_share_the_disk_tier(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    first, second = ResultCache(path=path), ResultCache(path=path)
+    first.put("a", b"from first")
+    assert second.get("a") == b"from first"
+    second.put("b", b"from second")
+    assert first.get("b") == b"from second"
+    assert first.stats()["disk_entries"] == second.stats()["disk_entries"] == 2
+    first.clear()
+    assert second.stats()["disk_entries"] == 0
+
+def test_disk_tier_evicts_least_recently_accessed(tmp_path):
+    cache = ResultCache(memory_bytes=0, path=str(tmp_path / "cache.sqlite3"), disk_bytes=30)
+    for key in "abc":
+        cache.put(key, b"x" * 10)
+        time.sleep(0.01)
+    # Reading "a" makes "b" the least recently accessed entry
+    assert cache.get("a") is not None
+    time.sleep(0.01)
+    cache.put("d", b"x" * 10)
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in "acd")
+    stats = cache.stats()
+    assert stats["disk_evictions"] == 1
+    assert stats["memory_evictions"] == 0
+    assert (stats["disk_entries"], stats["disk_size"]) == (3, 30)
@@ -0,0 +1,162 @@
+import numpy as np
+import pytest
+
+from engine import (
+    EnvelopeSolver, build_results_table, compute_combinations_batch, compute_envelope, results_rows, run_sweep,
+    sweep, sweep_points
+)
+from loads import (
+    COMBINATION_STAGES, DEFAULT_INPUTS, GAMMA_D_VALUES, STAGE_DESCRIPTIONS, calculate_concrete_load,
+    compute_combinations
+)
+
+ACTIONS = ("G_f", "G_c", "Q_w1", "Q_w2", "Q_w3", "Q_m", "Q_h", "W_s", "W_u", "F_w", "Q_x", "P_c", "I")
+
+def random_cases(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    return {name: rng.uniform(-5.0, 10.0, n) for name in ACTIONS}
+
+def scalar_loads(cases, i, gamma_d):
+    """Loads of case i from loads.compute_combinations, in combination order."""
+    loads = []
+    for stage in ("1", "2", "3"):
+        loads += compute_combinations(
+            cases["G_f"][i], cases["G_c"][i], cases[f"Q_w{stage}"][i], cases["Q_m"][i], cases["Q_h"][i],
+            cases["W_s"][i], cases["W_u"][i], cases["F_w"][i], cases["Q_x"][i], cases["P_c"][i], cases["I"][i],
+            stage, gamma_d
+        )
+    return np.array(loads)
+
+@pytest.mark.parametrize("gamma_d", GAMMA_D_VALUES)
+def test_batch_matches_scalar(gamma_d):
+    cases = random_cases()
+    batch = compute_combinations_batch(cases, gamma_d)
+    assert batch.shape == (200, len(COMBINATION_STAGES), 2)
+    for i in range(200):
+        np.testing.assert_allclose(batch[i], scalar_loads(cases, i, gamma_d), rtol=1e-12, atol=1e-12)
+
+def test_envelope_matches_scalar():
+    cases = random_cases(seed=1)
+    envelope = compute_envelope(cases)
+    assert envelope["loads"].shape == (200, len(GAMMA_D_VALUES), len(COMBINATION_STAGES), 2)
+    for i in range(200):
+        scalar = np.stack([scalar_loads(cases, i, gamma_d) for gamma_d in GAMMA_D_VALUES])
+        np.testing.assert_allclose(envelope["loads"][i], scalar, rtol=1e-12, atol=1e-12)
+        for direction, column in (("vertical", 0), ("horizontal", 1)):
+            g, c = np.unravel_index(np.argmax(scalar[..., column]), scalar[..., column].shape)
+            assert envelope[direction]["value"][i] == pytest.approx(scalar[g, c, column])
+
+def test_concrete_load_from_thickness():
+    cases = random_cases(5)
+    del cases["G_c"]
+    cases["thickness"] = np.linspace(0.1, 1.0, 5)
+    cases["reinforcement_percentage"] = np.full(5, 2.0)
+    batch = compute_combinations_batch(cases, 1.3)
+    G_c = [calculate_concrete_load(t, 2.0) for t in cases["thickness"]]
+    np.testing.assert_allclose(batch[:, 5, 0], 1.3 * (1.35 * cases["G_f"] + 1.35 * np.array(G_c)))
+
+def test_results_rows_match_stage_and_gamma_d():
+    table = build_results_table(dict(DEFAULT_INPUTS))
+    for stage in STAGE_DESCRIPTIONS:
+        for gamma_d in GAMMA_D_VALUES:
+            mask = (table["stage"] == int(stage)) & (table["gamma_d"] == gamma_d)
+            assert table.iloc[results_rows(stage, gamma_d)].equals(table[mask])
+
+def assert_envelopes_equal(got, expected):
+    """Compare two envelopes of one case up to rounding; tied combinations may come in either order."""
+    np.testing.assert_allclose(got["loads"], expected["loads"], rtol=1e-12, atol=1e-12)
+    for d, direction in enumerate(("vertical", "horizontal")):
+        np.testing.assert_allclose(got[direction]["value"], expected[direction]["value"], rtol=1e-12, atol=1e-12)
+        combination = got[direction]["combination"][0] - 1
+        g = GAMMA_D_VALUES.index(got[direction]["gamma_d"][0])
+        assert got[direction]["stage"][0] == COMBINATION_STAGES[combination]
+        assert got["loads"][0, g, combination, d] == got[direction]["value"][0]
+        ranked = [
+            [envelope["loads"][0, g, c, d] for g, c in envelope[f"{direction}_ranking"][0]]
+            for envelope in (got, expected)
+        ]
+        np.testing.assert_allclose(ranked[0], ranked[1], rtol=1e-12, atol=1e-12)
+
+def test_envelope_solver_matches_compute_envelope():
+    rng = np.random.default_rng(2)
+    inputs = dict(DEFAULT_INPUTS)
+    solver = EnvelopeSolver()
+    assert_envelopes_equal(solver.update(inputs), compute_envelope(inputs))
+    assert len(solver.affected) == len(COMBINATION_STAGES)
+    for _ in range(100):
+        name = rng.choice(list(DEFAULT_INPUTS))
+        inputs = dict(inputs, **{name: float(rng.uniform(0.05, 10.0))})
+        assert_envelopes_equal(solver.update(inputs), compute_envelope(inputs))
+
+@pytest.mark.parametrize("name, combinations", [
+    ("W_u", [3, 4, 11]),
+    ("Q_w1", [2]),
+    ("Q_w2", [7]),
+    ("Q_w3", [10]),
+    ("I", [5, 8, 12]),
+    ("thickness", [6, 7, 8, 9, 10, 11, 12]),
+    ("G_f", list(range(1, 13)))
+])
+def test_envelope_solver_affected_combinations(name, combinations):
+    inputs = dict(DEFAULT_INPUTS)
+    solver = EnvelopeSolver()
+    solver.update(inputs)
+    edited = dict(inputs, **{name: inputs[name] + 1.0})
+    assert_envelopes_equal(solver.update(edited), compute_envelope(edited))
+    assert (solver.affected + 1).tolist() == combinations
+    envelope = solver.envelope
+    assert solver.update(edited) is envelope
+    assert len(solver.affected) == 0
+
+SWEEP_RANGES = {"thickness": (0.1, 0.5, 5), "Q_m": (0.0, 2.0, 3), "W_u": (0.0, 1.0, 2)}
+
+def test_grid_sweep_covers_every_step():
+    points, n_points = sweep_points(SWEEP_RANGES)
+    assert n_points == 5 * 3 * 2
+    params = points(np.arange(n_points))
+    axes = [np.linspace(low, high, steps) for low, high, steps in SWEEP_RANGES.values()]
+    for index, row in enumerate(params):
+        i, j, k = np.unravel_index(index, (5, 3, 2))
+        np.testing.assert_array_equal(row, [axes[0][i], axes[1][j], axes[2][k]])
+    assert len({tuple(row) for row in params}) == n_points
+
+@pytest.mark.parametrize("method", ["grid", "lhs"])
+def test_chunked_sweep_matches_one_shot(method):
+    base = dict(DEFAULT_INPUTS)
+    params, loads = sweep(base, SWEEP_RANGES, method, samples=17, chunk_size=1000, seed=3)
+    assert params.dtype == np.float32 and loads.dtype == np.float32
+    for chunk_size in (1, 4, 7):
+        chunks = list(run_sweep(base, SWEEP_RANGES, method, samples=17, chunk_size=chunk_size, seed=3))
+        assert [start for start, _, _ in chunks] == list(range(0, len(params), chunk_size))
+        for _, chunk_params, chunk_loads in chunks:
+            assert chunk_params.dtype == np.float32 and chunk_loads.dtype == np.float32
+        np.testing.assert_array_equal(np.concatenate([c[1] for c in chunks]), params)
+        np.testing.assert_array_equal(np.concatenate([c[2] for c in chunks]), loads)
+
+def test_sweep_recalculates_concrete_load():
+    base = dict(DEFAULT_INPUTS, G_c=123.0)
+    params, loads = sweep(base, {"thickness": (0.1, 0.5, 5)})
+    assert loads.shape == (5, len(GAMMA_D_VALUES), 12, 2)
+    for thickness, point_loads in zip(params[:, 0], loads):
+        inputs = dict(DEFAULT_INPUTS, thickness=float(thickness))
+        inputs["G_c"] = calculate_concrete_load(inputs["thickness"], inputs["reinforcement_percentage"])
+        expected = compute_envelope(inputs)["loads"][0]
+        np.testing.assert_allclose(point_loads, expected, rtol=1e-6)
+    # Thicker slabs carry more concrete
+    assert (np.diff(loads[:, 0, 6, 0]) > 0).all()
+
+def test_lhs_sweep_is_reproducible():
+    first = sweep(dict(DEFAULT_INPUTS), SWEEP_RANGES, "lhs", samples=20, seed=5)
+    second = sweep(dict(DEFAULT_INPUTS), SWEEP_RANGES, "lhs", samples=20, seed=5)
+    other = sweep(dict(DEFAULT_INPUTS), SWEEP_RANGES, "lhs", samples=20, seed=6)
+    np.testing.assert_array_equal(first[0], second[0])
+    np.testing.assert_array_equal(first[1], second[1])
+    assert not np.array_equal(first[0], other[0])
+    assert first[0].shape == (20, 3)
+    lows = np.array([r[0] for r in SWEEP_RANGES.values()], dtype=np.float32)
+    highs = np.array([r[1] for r in SWEEP_RANGES.values()], dtype=np.float32)
+    assert ((first[0] >= lows) & (first[0] <= highs)).all()
+
+def test_unknown_sweep_method():
+    with pytest.raises(ValueError):
+        sweep_points(SWEEP_RANGES, "random")
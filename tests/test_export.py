@@ -0,0 +1,86 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pytest.importorskip("pyarrow.ipc")
+pytest.importorskip("pyarrow.parquet")
+
+from engine import build_results_table, compute_combinations_batch
+from export import TABLE_EXPORT_COLUMNS, ArrowResultWriter, export_results_table, long_format_columns
+from loads import COMBINATION_STAGES, DEFAULT_INPUTS, GAMMA_D_VALUES, calculate_concrete_load
+
+def random_chunk(rng, n):
+    cases = {name: rng.uniform(0.0, 5.0, n) for name in DEFAULT_INPUTS}
+    cases["G_c"] = calculate_concrete_load(cases["thickness"], cases["reinforcement_percentage"])
+    return cases
+
+def read_back(path, fmt):
+    if fmt == "parquet":
+        return pa.parquet.read_table(path)
+    with pa.ipc.open_file(path) as reader:
+        return reader.read_all()
+
+@pytest.mark.parametrize("fmt, ext", [("parquet", "parquet"), ("arrow", "arrow")])
+def test_writer_round_trip(tmp_path, fmt, ext):
+    rng = np.random.default_rng(1)
+    sizes = [3, 5, 1]
+    chunks = [random_chunk(rng, n) for n in sizes]
+    path = str(tmp_path / f"results.{ext}")
+    writer = ArrowResultWriter(path)
+    assert writer.format == fmt
+    start = 0
+    for cases, n in zip(chunks, sizes):
+        loads = np.stack([compute_combinations_batch(cases, gamma_d) for gamma_d in GAMMA_D_VALUES])
+        writer.write(long_format_columns(loads, GAMMA_D_VALUES, COMBINATION_STAGES, {
+            "case": [f"C{start + i}" for i in range(n)]
+        }))
+        start += n
+    writer.close()
+
+    table = read_back(path, fmt)
+    assert table.num_rows == sum(sizes) * len(GAMMA_D_VALUES) * len(COMBINATION_STAGES)
+    assert table.schema.field("stage").type == pa.int8()
+    assert table.schema.field("combination").type == pa.int8()
+    assert table.schema.field("vertical").type == pa.float64()
+    assert table.schema.field("horizontal").type == pa.float64()
+
+    frame = table.to_pandas()
+    offset = 0
+    for cases, n in zip(chunks, sizes):
+        rows = frame.iloc[offset:offset + n * len(GAMMA_D_VALUES) * len(COMBINATION_STAGES)]
+        for g, gamma_d in enumerate(GAMMA_D_VALUES):
+            expected = compute_combinations_batch(cases, gamma_d)
+            block = rows.iloc[g * n * 12:(g + 1) * n * 12]
+            assert (block["gamma_d"] == gamma_d).all()
+            np.testing.assert_array_equal(block["vertical"].to_numpy(), expected[..., 0].reshape(-1))
+            np.testing.assert_array_equal(block["horizontal"].to_numpy(), expected[..., 1].reshape(-1))
+            np.testing.assert_array_equal(block["combination"].to_numpy(), np.tile(np.arange(1, 13), n))
+        offset += len(rows)
+
+def test_writer_rejects_csv(tmp_path):
+    with pytest.raises(ValueError):
+        ArrowResultWriter(str(tmp_path / "results.csv"))
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "arrow"])
+def test_export_results_table(fmt):
+    results = build_results_table(dict(DEFAULT_INPUTS, G_c=calculate_concrete_load(0.2, 2.5)))
+    data = export_results_table(results, fmt)
+    if fmt == "csv":
+        frame = pd.read_csv(io.BytesIO(data))
+        np.testing.assert_allclose(frame["vertical"], results["vertical"], atol=1e-6)
+    else:
+        table = pa.parquet.read_table(io.BytesIO(data)) if fmt == "parquet" else pa.ipc.open_file(data).read_all()
+        assert table.schema.field("stage").type == pa.int8()
+        frame = table.to_pandas()
+        np.testing.assert_array_equal(frame["vertical"], results["vertical"])
+    assert list(frame.columns) == TABLE_EXPORT_COLUMNS
+    assert len(frame) == len(results)
+    np.testing.assert_array_equal(frame["stage"], results["stage"])
+    assert list(frame["description"]) == list(results["description"])
+
+def test_export_results_table_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        export_results_table(build_results_table(dict(DEFAULT_INPUTS)), "xlsx")
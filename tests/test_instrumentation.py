@@ -0,0 +1,49 @@
+import pytest
+
+import instrumentation
+from loads import compute_combinations
+
+@pytest.fixture
+def metrics():
+    instrumentation.reset_metrics()
+    instrumentation.enable()
+    yield
+    instrumentation.disable()
+    instrumentation.reset_metrics()
+
+def counts():
+    return {name: (m["count"], m["errors"]) for (name, _), m in instrumentation.metrics_snapshot().items()}
+
+def test_spans_are_recorded(metrics):
+    compute_combinations(0.6, 5.0, 1.0, 2.5, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, "1", 1.3)
+    compute_combinations(0.6, 5.0, 1.0, 2.5, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, "2", 1.0)
+    with pytest.raises(ValueError):
+        with instrumentation.span("failing", stage="2"):
+            raise ValueError("boom")
+
+    assert counts() == {"compute_combinations": (2, 0), "failing": (1, 1)}
+    snapshot = instrumentation.metrics_snapshot()
+    assert snapshot[("failing", (("stage", "2"),))]["count"] == 1
+    assert sum(snapshot[("compute_combinations", ())]["buckets"]) == 2
+
+    text = instrumentation.render_metrics()
+    assert 'as3610_span_seconds_count{span="compute_combinations"} 2' in text
+    assert 'as3610_span_seconds_bucket{span="compute_combinations",le="+Inf"} 2' in text
+    assert 'as3610_span_seconds_count{stage="2",span="failing"} 1' in text
+    assert 'as3610_span_errors_total{stage="2",span="failing"} 1' in text
+    assert 'as3610_span_errors_total{span="compute_combinations"} 0' in text
+
+def test_nothing_recorded_when_disabled(metrics):
+    instrumentation.disable()
+    compute_combinations(0.6, 5.0, 1.0, 2.5, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, "1", 1.3)
+    with instrumentation.span("disabled"):
+        pass
+    assert instrumentation.metrics_snapshot() == {}
+
+def test_write_metrics(metrics, tmp_path):
+    with instrumentation.span("written"):
+        pass
+    path = tmp_path / "metrics.prom"
+    instrumentation.write_metrics(str(path))
+    assert 'as3610_span_seconds_count{span="written"} 1' in path.read_text()
+    assert [p.name for p in tmp_path.iterdir()] == ["metrics.prom"]
@@ -0,0 +1,15 @@
+import os
+
+os.environ.setdefault("AS3610_LOGO_OFFLINE", "1")
+
+from batch import parse_case
+from engine import build_results_table
+from report import generate_pdf_report, write_consolidated_report
+
+def test_markup_in_names_is_escaped(tmp_path):
+    inputs = parse_case({"thickness": 0.3}, 0)["inputs"]
+    results = build_results_table(inputs)
+    path = tmp_path / "consolidated.pdf"
+    write_consolidated_report([("Grid <A>", inputs, results), ("B & C", inputs, results)], "<1>", "Site & <B>", str(path))
+    assert path.read_bytes().startswith(b"%PDF")
+    assert generate_pdf_report(inputs, results, "<1>", "Site & <B>").getvalue().startswith(b"%PDF")
@@ -0,0 +1,72 @@
+import random
+
+import numpy as np
+import pytest
+
+from engine import GAMMA_D_APPLIES, HORIZONTAL_FACTORS, VERTICAL_FACTORS, factor_matrices
+from loads import (
+    COMBINATION_DESCRIPTIONS, COMBINATION_DESCRIPTIONS_PLAIN, COMBINATION_RULES, COMBINATION_STAGES,
+    compute_combinations
+)
+
+def table_3_3_1(G_f, G_c, Q_w, Q_m, Q_h, W_s, W_u, F_w, Q_x, P_c, I, stage, gamma_d):
+    """The Table 3.3.1 formulas as written out by hand before the rule table."""
+    if stage == "1":
+        return [
+            (1.35 * G_f, 0.0),
+            (gamma_d * (1.2 * G_f + 1.5 * Q_w + 1.5 * Q_m + 1.0 * W_s), gamma_d * (1.5 * Q_h)),
+            (1.2 * G_f + 1.0 * W_u + 1.5 * F_w, 0.0),
+            (0.9 * G_f + 1.0 * W_u + 1.5 * F_w, 0.0),
+            (1.0 * G_f + 1.1 * I, 0.0)
+        ]
+    placement = (gamma_d * (1.2 * G_f + 1.2 * G_c + 1.5 * Q_w + 1.5 * Q_m + 1.0 * W_s + 1.5 * F_w + 1.5 * Q_x + 1.0 * P_c),
+                 gamma_d * (1.5 * Q_h))
+    if stage == "2":
+        return [(gamma_d * (1.35 * G_f + 1.35 * G_c), 0.0), placement, (1.0 * G_f + 1.0 * G_c + 1.1 * I, 0.0)]
+    return [
+        (gamma_d * (1.35 * G_f + 1.35 * G_c), 0.0),
+        placement,
+        (1.2 * G_f + 1.2 * G_c + 1.0 * W_u, 0.0),
+        (1.0 * G_f + 1.0 * G_c + 1.1 * I, 0.0)
+    ]
+
+@pytest.mark.parametrize("stage", ["1", "2", "3"])
+@pytest.mark.parametrize("gamma_d", [1.3, 1.0])
+def test_scalar_evaluator_is_bit_for_bit(stage, gamma_d):
+    rng = random.Random(stage + str(gamma_d))
+    for _ in range(2000):
+        args = [rng.uniform(-5.0, 10.0) for _ in range(11)]
+        assert compute_combinations(*args, stage, gamma_d) == table_3_3_1(*args, stage, gamma_d)
+
+def test_factor_matrices_match_scalar_evaluator():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        values = dict(zip(("G_f", "G_c", "Q_w1", "Q_w2", "Q_w3", "Q_m", "Q_h", "W_s", "W_u", "F_w", "Q_x", "P_c", "I"),
+                          rng.uniform(-5.0, 10.0, 13)))
+        x = np.array(list(values.values()))
+        for gamma_d in (1.3, 1.0):
+            scale = np.where(GAMMA_D_APPLIES, gamma_d, 1.0)
+            scalar = []
+            for stage in ("1", "2", "3"):
+                scalar += compute_combinations(
+                    values["G_f"], values["G_c"], values[f"Q_w{stage}"], values["Q_m"], values["Q_h"], values["W_s"],
+                    values["W_u"], values["F_w"], values["Q_x"], values["P_c"], values["I"], stage, gamma_d
+                )
+            np.testing.assert_allclose(VERTICAL_FACTORS @ x * scale, [v for v, _ in scalar], rtol=1e-12, atol=1e-12)
+            np.testing.assert_allclose(HORIZONTAL_FACTORS @ x * scale, [h for _, h in scalar], rtol=1e-12, atol=1e-12)
+
+def test_rule_table_layout():
+    assert COMBINATION_STAGES == ("1",) * 5 + ("2",) * 3 + ("3",) * 4
+    assert [rule[0] for rule in COMBINATION_RULES] == list(range(1, 13))
+    vertical, horizontal, gamma_d_applies = factor_matrices(COMBINATION_RULES)
+    assert vertical.shape == horizontal.shape == (12, 13)
+    assert list(np.flatnonzero(gamma_d_applies) + 1) == [2, 6, 7, 9, 10]
+    assert list(np.flatnonzero(horizontal.any(axis=1)) + 1) == [2, 7, 10]
+
+def test_descriptions():
+    assert COMBINATION_DESCRIPTIONS[0] == "1: 1.35G<sub>f</sub>"
+    assert COMBINATION_DESCRIPTIONS[1] == (
+        "2: 1.2G<sub>f</sub> + 1.5Q<sub>w</sub> + 1.5Q<sub>m</sub> + 1.5Q<sub>h</sub> + 1W<sub>s</sub>"
+    )
+    assert COMBINATION_DESCRIPTIONS_PLAIN[6] == "7: 1.2Gf + 1.2Gc + 1.5Qw + 1.5Qm + 1.5Qh + 1Ws + 1.5Fw + 1.5Qx + 1Pc"
+    assert COMBINATION_DESCRIPTIONS_PLAIN[10] == "11: 1.2Gf + 1.2Gc + 1Wu"
@@ -0,0 +1,53 @@
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+os.environ.setdefault("AS3610_LOGO_OFFLINE", "1")
+
+from service import make_server
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = make_server(port=0, report_workers=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    server.service.close()
+
+def post(url, body):
+    request = urllib.request.Request(url, data=body.encode(), headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as exc:
+        return exc.code, exc.read()
+
+def test_envelope(base_url):
+    status, data = post(base_url + "/envelope", json.dumps({"cases": [{"thickness": 0.3}, {}]}))
+    assert status == 200
+    assert len(json.loads(data)["results"]) == 2
+
+@pytest.mark.parametrize("body", [
+    '{"cases": [[1, 2]]}',
+    '{"cases": [{"thickness": NaN}]}',
+    '{"cases": [{"thickness": Infinity}]}',
+    '{"cases": [{"thickness": "abc"}]}',
+    '{"cases": []}'
+])
+def test_invalid_cases_are_rejected(base_url, body):
+    status, data = post(base_url + "/combinations", body)
+    assert status == 400
+    assert "error" in json.loads(data)
+
+def test_report(base_url):
+    status, data = post(base_url + "/report", json.dumps({"inputs": {"thickness": 0.3}, "project_name": "Test"}))
+    assert status == 200
+    assert data.startswith(b"%PDF")
+    status, _ = post(base_url + "/report", json.dumps({"inputs": [1]}))
+    assert status == 400